@@ -5,24 +5,41 @@ Custom agent configuration with skills-based assignment
 """
 
 import asyncio
-from typing import List, Dict, Optional, Any
+import sys
+from typing import List, Dict, Optional, Any, Iterator, Tuple, Union
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
+from functools import lru_cache
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from kimi_client import KimiClient, ProviderType, AgentSwarmConfig
 from agent_skills_library import AgentSkillsLibrary, AgentRole, AgentTemplate
 
 
-class TaskComplexity(Enum):
+class TaskComplexity(IntEnum):
     """Task complexity levels"""
-    LOW = "low"              # 5-15 agents
-    MEDIUM = "medium"        # 15-35 agents
-    HIGH = "high"            # 35-65 agents
-    EXTREME = "extreme"      # 65-100 agents
+    LOW = 1                  # 5-15 agents
+    MEDIUM = 2               # 15-35 agents
+    HIGH = 3                 # 35-65 agents
+    EXTREME = 4              # 65-100 agents
+
+
+# Display names, as used in prompts and by the skills library
+_COMPLEXITY_NAMES: Dict[TaskComplexity, str] = {
+    TaskComplexity.LOW: "low",
+    TaskComplexity.MEDIUM: "medium",
+    TaskComplexity.HIGH: "high",
+    TaskComplexity.EXTREME: "extreme"
+}
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentAssignment:
     """Individual agent assignment"""
     agent_template: AgentTemplate
@@ -31,7 +48,7 @@ class AgentAssignment:
     priority: int = 1  # 1-5, higher = more critical
 
 
-@dataclass
+@dataclass(slots=True)
 class SwarmConfiguration:
     """Complete swarm configuration"""
     task_description: str
@@ -42,129 +59,71 @@ class SwarmConfiguration:
     context: Dict[str, Any] = field(default_factory=dict)
 
 
-class AdvancedOrchestrator:
-    """Advanced agent orchestrator with custom skills"""
+# Target agent count per complexity (midpoint of each level's range),
+# indexed by complexity - 1
+_TARGET_AGENTS: Tuple[int, ...] = (
+    (5 + 15) // 2,
+    (15 + 35) // 2,
+    (35 + 65) // 2,
+    (65 + 100) // 2
+)
 
-    def __init__(
-        self,
-        provider: ProviderType = ProviderType.OLLAMA,
-        max_agents: int = 100
-    ):
-        self.client = KimiClient(
-            provider=provider,
-            swarm_config=AgentSwarmConfig(
-                max_agents=max_agents,
-                parallel_execution=True,
-                enable_thinking_mode=True
-            )
-        )
-        self.skills_library = AgentSkillsLibrary()
-
-    def create_swarm_config(
-        self,
-        task: str,
-        complexity: TaskComplexity,
-        agent_roles: List[AgentRole],
-        execution_strategy: str = "parallel",
-        context: Optional[Dict[str, Any]] = None
-    ) -> SwarmConfiguration:
-        """Create a swarm configuration from agent roles"""
-
-        agent_assignments = []
-        total_agents = 0
-
-        # Get complexity-based agent count
-        complexity_ranges = {
-            TaskComplexity.LOW: (5, 15),
-            TaskComplexity.MEDIUM: (15, 35),
-            TaskComplexity.HIGH: (35, 65),
-            TaskComplexity.EXTREME: (65, 100)
-        }
-
-        min_agents, max_agents = complexity_ranges[complexity]
-        target_agents = (min_agents + max_agents) // 2
-
-        # Distribute agents across roles
-        agents_per_role = target_agents // len(agent_roles)
-        remainder = target_agents % len(agent_roles)
-
-        for i, role in enumerate(agent_roles):
-            template = self.skills_library.get_agent_by_role(role)
-            if template:
-                # Give extra agents to first roles (usually more important)
-                count = agents_per_role + (1 if i < remainder else 0)
-                agent_assignments.append(AgentAssignment(
-                    agent_template=template,
-                    count=count,
-                    priority=5 - (i // 2)  # Decrease priority for later agents
-                ))
-                total_agents += count
 
-        return SwarmConfiguration(
-            task_description=task,
-            complexity=complexity,
-            agent_assignments=agent_assignments,
-            total_agents=total_agents,
-            execution_strategy=execution_strategy,
-            context=context or {}
-        )
+@lru_cache(maxsize=32)
+def _distribute(target: int, n: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Split target agents across n roles, returning (counts, priorities)"""
+    agents_per_role, remainder = divmod(target, n)
+    # Give extra agents to first roles (usually more important)
+    counts = tuple(agents_per_role + (1 if i < remainder else 0) for i in range(n))
+    # Decrease priority for later agents
+    priorities = tuple(5 - (i // 2) for i in range(n))
+    return counts, priorities
 
-    def generate_prompt_from_config(self, config: SwarmConfiguration) -> str:
-        """Generate optimized prompt from swarm configuration"""
 
-        prompt = f"""# Task: {config.task_description}
+# Prompt skeleton, defined once at import and filled with str.format per call
+_PROMPT_HEADER = """# Task: {task}
 
 ## Agent Swarm Configuration
 
-**Total Agents**: {config.total_agents}
-**Complexity**: {config.complexity.value}
-**Execution Strategy**: {config.execution_strategy}
+**Total Agents**: {total_agents}
+**Complexity**: {complexity}
+**Execution Strategy**: {strategy}
 
 ## Agent Assignments & Specializations
 
 """
 
-        for assignment in config.agent_assignments:
-            template = assignment.agent_template
-            prompt += f"""
-### {template.name} (Priority: {assignment.priority}) - {assignment.count} agents
+_ASSIGNMENT_HEADER = "\n### {name} (Priority: {priority}) - {count} agents\n"
 
-**Role**: {template.role.value}
-**Focus**: {template.primary_focus}
-**Expertise Level**: {template.expertise_level}
+_TEMPLATE_HEADER = """
+**Role**: {role}
+**Focus**: {primary_focus}
+**Expertise Level**: {expertise_level}
 
 **Key Skills**:
 """
-            for skill in template.skills:
-                prompt += f"- {skill.name}: {skill.description}\n"
-                prompt += f"  Expertise: {', '.join(skill.expertise_areas)}\n"
 
-            if assignment.specific_tasks:
-                prompt += f"\n**Specific Tasks**:\n"
-                for task in assignment.specific_tasks:
-                    prompt += f"- {task}\n"
+_SKILL_LINES = "- {name}: {description}\n  Expertise: {expertise}\n"
 
-            prompt += "\n"
+_CONTEXT_BLOCK = "\n## Additional Context\n\n{context}\n"
 
-        # Add execution strategy instructions
-        if config.execution_strategy == "parallel":
-            prompt += """
+# Static prompt sections, rendered once at import instead of on every call
+_STRATEGY_BLOCKS: Dict[str, str] = {
+    "parallel": """
 ## Execution Strategy: Parallel
 
 All agents should work simultaneously on their assigned tasks. Coordinate to avoid
 duplication and ensure comprehensive coverage.
-"""
-        elif config.execution_strategy == "pipeline":
-            prompt += """
+""",
+    "pipeline": """
 ## Execution Strategy: Pipeline
 
 Agents execute in stages:
 1. First priority agents complete their tasks
 2. Results feed into next stage
 3. Continue until all stages complete
-"""
-        elif config.execution_strategy == "hierarchical":
-            prompt += """
+""",
+    "hierarchical": """
 ## Execution Strategy: Hierarchical
 
 Create a hierarchy:
@@ -173,13 +132,9 @@ Create a hierarchy:
 - Specialists execute detailed tasks
 - Synthesizer combines all outputs
 """
+}
 
-        # Add context
-        if config.context:
-            prompt += f"\n## Additional Context\n\n{json.dumps(config.context, indent=2)}\n"
-
-        # Add output format
-        prompt += """
+_EXPECTED_OUTPUT = """
 ## Expected Output
 
 Provide a comprehensive report that:
@@ -192,7 +147,181 @@ Provide a comprehensive report that:
 Format the output with clear sections, bullet points, and specific details.
 """
 
-        return prompt
+
+# Cache key per assignment: (template key, count, priority, specific_tasks).
+# Library templates are keyed by role, which is far cheaper to hash than the
+# template itself; custom templates are frozen, so they key by value
+_TemplateKey = Union[AgentRole, AgentTemplate]
+_LayoutKey = Tuple[Tuple[_TemplateKey, int, int, Tuple[str, ...]], ...]
+
+
+def _dumps_context(context: Dict[str, Any]) -> str:
+    """Serialize swarm context for the prompt, preferring orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            context,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(context, indent=2)
+
+
+def _template_key(template: AgentTemplate) -> _TemplateKey:
+    """Role for the skills library's own template for that role, else the template"""
+    role = template.role
+    return role if AgentSkillsLibrary.get_agent_by_role(role) is template else template
+
+
+def _template_for(key: _TemplateKey) -> AgentTemplate:
+    """Inverse of _template_key"""
+    if isinstance(key, AgentTemplate):
+        return key
+    return AgentSkillsLibrary.get_agent_by_role(key)
+
+
+@lru_cache(maxsize=256)
+def _render_template(template: AgentTemplate) -> str:
+    """Render the static role/skills section of an agent template"""
+    header = _TEMPLATE_HEADER.format(
+        role=template.role.value,
+        primary_focus=template.primary_focus,
+        expertise_level=template.expertise_level
+    )
+    skills = "".join([
+        _SKILL_LINES.format(
+            name=skill.name,
+            description=skill.description,
+            expertise=", ".join(skill.expertise_areas)
+        )
+        for skill in template.skills
+    ])
+    return header + skills
+
+
+def _layout_key(config: SwarmConfiguration) -> _LayoutKey:
+    """Hashable description of everything in the prompt body except task and context"""
+    return tuple([
+        (_template_key(a.agent_template), a.count, a.priority, tuple(a.specific_tasks))
+        for a in config.agent_assignments
+    ])
+
+
+@lru_cache(maxsize=128)
+def _render_body(layout: _LayoutKey, strategy: str) -> str:
+    """Render assignment sections and strategy block for a swarm layout
+
+    Swarms that reuse a layout with a different task (or context) get this
+    pre-rendered, so only the header and context are formatted per call.
+    """
+    parts: List[str] = []
+    append = parts.append
+
+    for template_key, count, priority, specific_tasks in layout:
+        template = _template_for(template_key)
+        append(_ASSIGNMENT_HEADER.format(name=template.name, priority=priority, count=count))
+        append(_render_template(template))
+
+        if specific_tasks:
+            append("\n**Specific Tasks**:\n")
+            append("".join([f"- {task}\n" for task in specific_tasks]))
+
+        append("\n")
+
+    # Add execution strategy instructions
+    append(_STRATEGY_BLOCKS.get(strategy, ""))
+
+    return "".join(parts)
+
+
+def _iter_prompt(config: SwarmConfiguration) -> Iterator[str]:
+    """Yield the swarm prompt section by section, in order"""
+    yield _PROMPT_HEADER.format(
+        task=config.task_description,
+        total_agents=config.total_agents,
+        complexity=_COMPLEXITY_NAMES[config.complexity],
+        strategy=config.execution_strategy
+    )
+
+    yield _render_body(_layout_key(config), config.execution_strategy)
+
+    # Add context
+    if config.context:
+        yield _CONTEXT_BLOCK.format(context=_dumps_context(config.context))
+
+    # Add output format
+    yield _EXPECTED_OUTPUT
+
+
+def _build_prompt(config: SwarmConfiguration) -> str:
+    """Assemble the full swarm prompt for a configuration"""
+    return "".join(_iter_prompt(config))
+
+
+class AdvancedOrchestrator:
+    """Advanced agent orchestrator with custom skills
+
+    Orchestrators share a connection pool only when given the same client.
+    An injected client stays owned by the caller; otherwise the orchestrator
+    creates its own, and close() (or ``async with``) must be called to
+    release it.
+    """
+
+    def __init__(
+        self,
+        provider: ProviderType = ProviderType.OLLAMA,
+        max_agents: int = 100,
+        client: Optional[KimiClient] = None
+    ):
+        self._owns_client = client is None
+        if client is None:
+            client = KimiClient(
+                provider=provider,
+                swarm_config=AgentSwarmConfig(
+                    max_agents=max_agents,
+                    parallel_execution=True,
+                    enable_thinking_mode=True
+                )
+            )
+        self.client = client
+        self._closed = False
+        self.skills_library = AgentSkillsLibrary()
+
+    def create_swarm_config(
+        self,
+        task: str,
+        complexity: TaskComplexity,
+        agent_roles: List[AgentRole],
+        execution_strategy: str = "parallel",
+        context: Optional[Dict[str, Any]] = None
+    ) -> SwarmConfiguration:
+        """Create a swarm configuration from agent roles"""
+
+        agent_assignments = []
+        total_agents = 0
+
+        counts, priorities = _distribute(_TARGET_AGENTS[complexity - 1], len(agent_roles))
+
+        for role, count, priority in zip(agent_roles, counts, priorities):
+            template = self.skills_library.get_agent_by_role(role)
+            if template:
+                agent_assignments.append(AgentAssignment(
+                    agent_template=template,
+                    count=count,
+                    priority=priority
+                ))
+                total_agents += count
+
+        return SwarmConfiguration(
+            task_description=task,
+            complexity=complexity,
+            agent_assignments=agent_assignments,
+            total_agents=total_agents,
+            execution_strategy=execution_strategy,
+            context=context or {}
+        )
+
+    def generate_prompt_from_config(self, config: SwarmConfiguration) -> str:
+        """Generate optimized prompt from swarm configuration"""
+        return _build_prompt(config)
 
     async def execute_swarm(
         self,
@@ -202,12 +331,16 @@ Format the output with clear sections, bullet points, and specific details.
 
         prompt = self.generate_prompt_from_config(config)
 
-        print(f"🚀 Executing Agent Swarm")
-        print(f"  Total Agents: {config.total_agents}")
-        print(f"  Complexity: {config.complexity.value}")
-        print(f"  Strategy: {config.execution_strategy}")
-        print(f"  Agent Types: {len(config.agent_assignments)}")
-        print()
+        # One write per swarm instead of a print (and flush) per status line
+        sys.stdout.write(
+            "🚀 Executing Agent Swarm\n"
+            f"  Total Agents: {config.total_agents}\n"
+            f"  Complexity: {_COMPLEXITY_NAMES[config.complexity]}\n"
+            f"  Strategy: {config.execution_strategy}\n"
+            f"  Agent Types: {len(config.agent_assignments)}\n"
+            "\n"
+        )
+        sys.stdout.flush()
 
         response = await self.client.agent_swarm_task(
             task=prompt,
@@ -217,6 +350,29 @@ Format the output with clear sections, bullet points, and specific details.
 
         return response
 
+    async def execute_many(
+        self,
+        configs: List[SwarmConfiguration],
+        fail_fast: bool = True
+    ) -> List[Any]:
+        """Execute several swarms concurrently
+
+        With fail_fast, the first failing swarm cancels the rest and the errors
+        are raised as an ExceptionGroup. Otherwise every swarm runs to
+        completion and failures are returned in place of their results.
+        """
+
+        if not fail_fast:
+            return await asyncio.gather(
+                *(self.execute_swarm(config) for config in configs),
+                return_exceptions=True
+            )
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self.execute_swarm(config)) for config in configs]
+
+        return [task.result() for task in tasks]
+
     async def execute_custom_swarm(
         self,
         task: str,
@@ -249,7 +405,7 @@ Format the output with clear sections, bullet points, and specific details.
         # Get recommended agents
         recommended = self.skills_library.recommend_agents_for_task(
             task_type,
-            complexity.value
+            _COMPLEXITY_NAMES[complexity]
         )
 
         agent_roles = [agent.role for agent in recommended]
@@ -262,8 +418,13 @@ Format the output with clear sections, bullet points, and specific details.
         )
 
     async def close(self):
-        """Close the client"""
-        await self.client.close()
+        """Close the client, unless it was injected by the caller"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._owns_client:
+            await self.client.close()
 
     async def __aenter__(self):
         return self
@@ -272,6 +433,12 @@ Format the output with clear sections, bullet points, and specific details.
         await self.close()
 
 
+def _preview(obj: Any, n: int = 500) -> Tuple[int, str]:
+    """Stringify a result once, returning its length and first n characters"""
+    rendered = str(obj)
+    return len(rendered), rendered[:n]
+
+
 # Example usage
 async def main():
     """Demonstration of advanced orchestrator"""
@@ -295,7 +462,8 @@ async def main():
             AgentRole.CRYPTOGRAPHER
         ]
 
-        result1 = await orchestrator.execute_custom_swarm(
+        # Examples share no state, so build the swarms first and run them together
+        swarm1 = orchestrator.execute_custom_swarm(
             task="""Perform comprehensive security audit of a Flask-based web application:
             - Identify all OWASP Top 10 vulnerabilities
             - Review authentication and authorization mechanisms
@@ -313,15 +481,11 @@ async def main():
             }
         )
 
-        print("\n✅ Security Audit Complete")
-        print(f"Response length: {len(str(result1))} characters")
-        print(f"Preview: {str(result1)[:500]}...")
-
         # Example 2: Recommended agents for market analysis
         print("\n\n📋 Example 2: Market Analysis with Recommended Agents")
         print("-" * 80)
 
-        result2 = await orchestrator.execute_recommended_swarm(
+        swarm2 = orchestrator.execute_recommended_swarm(
             task="""Analyze the AI agent framework market:
             - Identify top 10 competitors
             - Evaluate strengths, weaknesses, opportunities, threats
@@ -338,9 +502,6 @@ async def main():
             }
         )
 
-        print("\n✅ Market Analysis Complete")
-        print(f"Response length: {len(str(result2))} characters")
-
         # Example 3: Complex software development project
         print("\n\n📋 Example 3: Full-Stack Development Project")
         print("-" * 80)
@@ -356,7 +517,7 @@ async def main():
             AgentRole.PERFORMANCE_ENGINEER
         ]
 
-        result3 = await orchestrator.execute_custom_swarm(
+        swarm3 = orchestrator.execute_custom_swarm(
             task="""Design and plan a real-time fleet management system:
             - System architecture (microservices, event-driven)
             - Backend APIs (REST + GraphQL)
@@ -381,8 +542,20 @@ async def main():
             }
         )
 
+        result1, result2, result3 = await asyncio.gather(swarm1, swarm2, swarm3)
+
+        length1, preview1 = _preview(result1)
+        print("\n✅ Security Audit Complete")
+        print(f"Response length: {length1} characters")
+        print(f"Preview: {preview1}...")
+
+        length2, _ = _preview(result2)
+        print("\n✅ Market Analysis Complete")
+        print(f"Response length: {length2} characters")
+
+        length3, _ = _preview(result3)
         print("\n✅ Development Plan Complete")
-        print(f"Response length: {len(str(result3))} characters")
+        print(f"Response length: {length3} characters")
 
     print("\n" + "=" * 80)
     print("✅ All Examples Complete!")
@@ -390,4 +563,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop is optional; fall back to the default event loop when missing
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
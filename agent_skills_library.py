@@ -4,13 +4,19 @@ Kimi K2.5 Agent Skills Library
 Comprehensive library of specialized agent templates and skills
 """
 
-from enum import Enum
-from typing import List, Dict, Optional
+import functools
+import sys
+from collections import defaultdict
+from enum import Enum, StrEnum
+from itertools import islice
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass
 
 
-class AgentRole(Enum):
-    """Predefined agent roles"""
+class AgentRole(StrEnum):
+    """Predefined agent roles (members are their string values)"""
     # Research & Analysis
     RESEARCH_SPECIALIST = "research_specialist"
     DATA_ANALYST = "data_analyst"
@@ -63,366 +69,482 @@ class AgentRole(Enum):
     DATA_SCIENTIST = "data_scientist"
 
 
-@dataclass
+class TaskType(Enum):
+    """Task types with predefined agent recommendations"""
+    SECURITY_AUDIT = "security_audit"
+    RESEARCH = "research"
+    SOFTWARE_DEVELOPMENT = "software_development"
+    MARKET_ANALYSIS = "market_analysis"
+
+
+@dataclass(slots=True, frozen=True)
 class AgentSkill:
     """Individual agent skill definition"""
     name: str
     description: str
-    expertise_areas: List[str]
-    tools: List[str]
-    output_types: List[str]
+    expertise_areas: Tuple[str, ...]
+    tools: Tuple[str, ...]
+    output_types: Tuple[str, ...]
+
+    def __post_init__(self):
+        # Vocabulary such as "Web search" or "SAST" repeats across templates;
+        # interning shares one string per term and makes membership tests
+        # hit the identity fast path
+        for attr in ("expertise_areas", "tools", "output_types"):
+            object.__setattr__(self, attr, tuple(map(sys.intern, getattr(self, attr))))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentTemplate:
     """Complete agent template with skills and configuration"""
     role: AgentRole
     name: str
     description: str
-    skills: List[AgentSkill]
+    skills: Tuple[AgentSkill, ...]
     primary_focus: str
     expertise_level: str  # junior, mid, senior, expert
     optimal_team_size: int
-    works_best_with: List[AgentRole]
+    works_best_with: Tuple[AgentRole, ...]
+
+    def __post_init__(self):
+        # Interned so prompt-cache keys built from these compare by identity
+        # (object.__setattr__ because the dataclass is frozen)
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "primary_focus", sys.intern(self.primary_focus))
+        object.__setattr__(self, "expertise_level", sys.intern(self.expertise_level))
+
+
+# One shared AgentSkill per skill name, reused by every template that lists it
+_SKILL_REGISTRY: Dict[str, AgentSkill] = {}
+
+
+def _skill(
+    name: str,
+    description: str,
+    expertise_areas: Tuple[str, ...],
+    tools: Tuple[str, ...],
+    output_types: Tuple[str, ...]
+) -> AgentSkill:
+    """Get the registered skill with this name, registering it on first use"""
+    skill = AgentSkill(name, description, expertise_areas, tools, output_types)
+    shared = _SKILL_REGISTRY.setdefault(name, skill)
+    if shared != skill:
+        raise ValueError(f"Skill {name!r} is already registered with a different definition")
+    return shared
+
+
+class _Catalog(NamedTuple):
+    """Agent templates per category, plus every template by role"""
+    research: Mapping[AgentRole, AgentTemplate]
+    development: Mapping[AgentRole, AgentTemplate]
+    security: Mapping[AgentRole, AgentTemplate]
+    content: Mapping[AgentRole, AgentTemplate]
+    all: Mapping[AgentRole, AgentTemplate]
+    collaborators: Mapping[AgentRole, Tuple[AgentRole, ...]]
+
+
+@functools.cache
+def _catalog() -> _Catalog:
+    """Build the agent templates on first use and share them read-only afterwards"""
+    # Deferred so that importing the module for AgentRole/TaskType alone
+    # does not construct (and intern) every skill and template
+    research = MappingProxyType({
+        AgentRole.RESEARCH_SPECIALIST: AgentTemplate(
+            role=AgentRole.RESEARCH_SPECIALIST,
+            name="Research Specialist",
+            description="Deep-dive research on specific topics with academic rigor",
+            skills=(
+                _skill(
+                    name="Literature Review",
+                    description="Comprehensive review of academic and industry literature",
+                    expertise_areas=("Academic papers", "Industry reports", "Technical docs"),
+                    tools=("Web search", "Academic databases", "Citation tracking"),
+                    output_types=("Research summaries", "Bibliographies", "State-of-the-art analysis")
+                ),
+                _skill(
+                    name="Data Collection",
+                    description="Systematic collection of relevant data and sources",
+                    expertise_areas=("Primary sources", "Data extraction", "Survey design"),
+                    tools=("APIs", "Web scraping", "Database queries"),
+                    output_types=("Datasets", "Source lists", "Data reports")
+                ),
+                _skill(
+                    name="Synthesis",
+                    description="Combining multiple sources into coherent insights",
+                    expertise_areas=("Pattern recognition", "Trend analysis", "Critical thinking"),
+                    tools=("Analysis frameworks", "Visualization"),
+                    output_types=("Executive summaries", "Insight reports")
+                )
+            ),
+            primary_focus="In-depth research and analysis",
+            expertise_level="expert",
+            optimal_team_size=5,
+            works_best_with=(AgentRole.DATA_ANALYST, AgentRole.TECHNICAL_WRITER)
+        ),
+
+        AgentRole.MARKET_ANALYST: AgentTemplate(
+            role=AgentRole.MARKET_ANALYST,
+            name="Market Analyst",
+            description="Competitive intelligence and market research",
+            skills=(
+                _skill(
+                    name="Competitive Analysis",
+                    description="In-depth analysis of competitors and market positioning",
+                    expertise_areas=("Competitor profiling", "SWOT analysis", "Market share"),
+                    tools=("Market data", "Financial reports", "Customer reviews"),
+                    output_types=("Competitive matrices", "Market reports")
+                ),
+                _skill(
+                    name="Trend Forecasting",
+                    description="Predicting market trends and opportunities",
+                    expertise_areas=("Trend analysis", "Forecasting", "Scenario planning"),
+                    tools=("Statistical models", "Industry data"),
+                    output_types=("Trend reports", "Forecasts", "Opportunity analysis")
+                )
+            ),
+            primary_focus="Market intelligence and competitive analysis",
+            expertise_level="senior",
+            optimal_team_size=3,
+            works_best_with=(AgentRole.BUSINESS_ANALYST, AgentRole.FINANCIAL_ANALYST)
+        )
+    })
+
+    development = MappingProxyType({
+        AgentRole.SOFTWARE_ARCHITECT: AgentTemplate(
+            role=AgentRole.SOFTWARE_ARCHITECT,
+            name="Software Architect",
+            description="System design and architectural decision-making",
+            skills=(
+                _skill(
+                    name="Architecture Design",
+                    description="Designing scalable, maintainable system architectures",
+                    expertise_areas=("Microservices", "Monoliths", "Serverless", "Event-driven"),
+                    tools=("UML", "Architecture diagrams", "Design patterns"),
+                    output_types=("Architecture diagrams", "Design docs", "Tech specs")
+                ),
+                _skill(
+                    name="Technology Selection",
+                    description="Choosing optimal technologies for requirements",
+                    expertise_areas=("Technology evaluation", "Trade-off analysis"),
+                    tools=("Proof of concepts", "Benchmarking"),
+                    output_types=("Technology recommendations", "Comparison matrices")
+                ),
+                _skill(
+                    name="Scalability Planning",
+                    description="Ensuring systems can scale effectively",
+                    expertise_areas=("Load balancing", "Caching", "Database sharding"),
+                    tools=("Performance modeling", "Capacity planning"),
+                    output_types=("Scalability plans", "Performance specs")
+                )
+            ),
+            primary_focus="High-level system architecture and technical strategy",
+            expertise_level="expert",
+            optimal_team_size=2,
+            works_best_with=(AgentRole.BACKEND_DEVELOPER, AgentRole.DEVOPS_ENGINEER)
+        ),
+
+        AgentRole.SECURITY_ENGINEER: AgentTemplate(
+            role=AgentRole.SECURITY_ENGINEER,
+            name="Security Engineer",
+            description="Application and infrastructure security",
+            skills=(
+                _skill(
+                    name="Threat Modeling",
+                    description="Identifying and mitigating security threats",
+                    expertise_areas=("STRIDE", "Attack trees", "Risk assessment"),
+                    tools=("Threat modeling tools", "CVSS scoring"),
+                    output_types=("Threat models", "Risk registers")
+                ),
+                _skill(
+                    name="Security Architecture",
+                    description="Designing secure systems and defenses",
+                    expertise_areas=("Defense in depth", "Zero trust", "Encryption"),
+                    tools=("Security frameworks", "Compliance standards"),
+                    output_types=("Security architectures", "Security requirements")
+                ),
+                _skill(
+                    name="Incident Response",
+                    description="Responding to security incidents",
+                    expertise_areas=("Forensics", "Containment", "Recovery"),
+                    tools=("SIEM", "Log analysis", "Forensic tools"),
+                    output_types=("Incident reports", "Remediation plans")
+                )
+            ),
+            primary_focus="Security architecture and threat mitigation",
+            expertise_level="expert",
+            optimal_team_size=3,
+            works_best_with=(AgentRole.SECURITY_AUDITOR, AgentRole.PENETRATION_TESTER)
+        )
+    })
+
+    security = MappingProxyType({
+        AgentRole.SECURITY_AUDITOR: AgentTemplate(
+            role=AgentRole.SECURITY_AUDITOR,
+            name="Security Auditor",
+            description="Code review and vulnerability assessment",
+            skills=(
+                _skill(
+                    name="Code Security Review",
+                    description="Analyzing code for security vulnerabilities",
+                    expertise_areas=("OWASP Top 10", "CWE Top 25", "Secure coding"),
+                    tools=("SAST", "DAST", "Code scanners"),
+                    output_types=("Vulnerability reports", "Remediation guides")
+                ),
+                _skill(
+                    name="Compliance Audit",
+                    description="Ensuring compliance with security standards",
+                    expertise_areas=("PCI-DSS", "HIPAA", "SOC 2", "ISO 27001"),
+                    tools=("Compliance frameworks", "Audit tools"),
+                    output_types=("Compliance reports", "Gap analysis")
+                )
+            ),
+            primary_focus="Security auditing and compliance",
+            expertise_level="senior",
+            optimal_team_size=4,
+            works_best_with=(AgentRole.SECURITY_ENGINEER, AgentRole.COMPLIANCE_OFFICER)
+        ),
+
+        AgentRole.PENETRATION_TESTER: AgentTemplate(
+            role=AgentRole.PENETRATION_TESTER,
+            name="Penetration Tester",
+            description="Offensive security and exploit detection",
+            skills=(
+                _skill(
+                    name="Vulnerability Exploitation",
+                    description="Identifying and exploiting security vulnerabilities",
+                    expertise_areas=("SQL injection", "XSS", "CSRF", "Authentication bypass"),
+                    tools=("Burp Suite", "Metasploit", "Custom exploits"),
+                    output_types=("Penetration test reports", "Exploit POCs")
+                ),
+                _skill(
+                    name="Red Team Operations",
+                    description="Simulating advanced persistent threats",
+                    expertise_areas=("Social engineering", "Lateral movement", "Privilege escalation"),
+                    tools=("C2 frameworks", "Reconnaissance tools"),
+                    output_types=("Attack narratives", "Security recommendations")
+                )
+            ),
+            primary_focus="Offensive security and vulnerability exploitation",
+            expertise_level="expert",
+            optimal_team_size=2,
+            works_best_with=(AgentRole.SECURITY_AUDITOR, AgentRole.SECURITY_ENGINEER)
+        )
+    })
+
+    content = MappingProxyType({
+        AgentRole.TECHNICAL_WRITER: AgentTemplate(
+            role=AgentRole.TECHNICAL_WRITER,
+            name="Technical Writer",
+            description="Technical documentation and developer guides",
+            skills=(
+                _skill(
+                    name="API Documentation",
+                    description="Writing comprehensive API documentation",
+                    expertise_areas=("REST", "GraphQL", "OpenAPI", "SDK docs"),
+                    tools=("Swagger", "Postman", "Documentation generators"),
+                    output_types=("API references", "Integration guides")
+                ),
+                _skill(
+                    name="User Documentation",
+                    description="Creating user-friendly documentation",
+                    expertise_areas=("User guides", "Tutorials", "Troubleshooting"),
+                    tools=("Markdown", "Documentation platforms"),
+                    output_types=("User manuals", "Quick start guides", "FAQs")
+                )
+            ),
+            primary_focus="Clear, comprehensive technical documentation",
+            expertise_level="senior",
+            optimal_team_size=3,
+            works_best_with=(AgentRole.SOFTWARE_ARCHITECT, AgentRole.BACKEND_DEVELOPER)
+        )
+    })
+
+    all_agents = MappingProxyType({**research, **development, **security, **content})
+
+    # Reverse works_best_with edges: role -> roles that list it as a partner
+    collaborators = defaultdict(list)
+    for template in all_agents.values():
+        for partner in template.works_best_with:
+            collaborators[partner].append(template.role)
+
+    return _Catalog(
+        research=research,
+        development=development,
+        security=security,
+        content=content,
+        all=all_agents,
+        collaborators=MappingProxyType(
+            {role: tuple(roles) for role, roles in collaborators.items()}
+        )
+    )
+
+
+# Recommended roles per task type, in priority order
+_RECOMMENDATIONS: Mapping[TaskType, Tuple[AgentRole, ...]] = MappingProxyType({
+    TaskType.SECURITY_AUDIT: (
+        AgentRole.SECURITY_AUDITOR,
+        AgentRole.PENETRATION_TESTER,
+        AgentRole.SECURITY_ENGINEER,
+        AgentRole.COMPLIANCE_OFFICER
+    ),
+    TaskType.RESEARCH: (
+        AgentRole.RESEARCH_SPECIALIST,
+        AgentRole.DATA_ANALYST,
+        AgentRole.FACT_CHECKER,
+        AgentRole.TECHNICAL_WRITER
+    ),
+    TaskType.SOFTWARE_DEVELOPMENT: (
+        AgentRole.SOFTWARE_ARCHITECT,
+        AgentRole.BACKEND_DEVELOPER,
+        AgentRole.FRONTEND_DEVELOPER,
+        AgentRole.QA_ENGINEER,
+        AgentRole.DEVOPS_ENGINEER
+    ),
+    TaskType.MARKET_ANALYSIS: (
+        AgentRole.MARKET_ANALYST,
+        AgentRole.BUSINESS_ANALYST,
+        AgentRole.FINANCIAL_ANALYST,
+        AgentRole.DATA_ANALYST
+    )
+})
+
+# Scale of the recommended team relative to the role list, per complexity
+_COMPLEXITY_MULTIPLIERS: Mapping[str, float] = MappingProxyType({
+    "low": 0.5,
+    "medium": 1.0,
+    "high": 1.5,
+    "extreme": 2.0
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _recommended_templates(
+    task_type: Union[TaskType, str],
+    complexity: str
+) -> Tuple[AgentTemplate, ...]:
+    """Recommended templates for one (task_type, complexity) pair, computed once"""
+    # Get recommended roles; unknown task types get no recommendations
+    try:
+        roles = _RECOMMENDATIONS[TaskType(task_type)]
+    except (KeyError, ValueError):
+        roles = ()
+
+    # Adjust count based on complexity
+    multiplier = _COMPLEXITY_MULTIPLIERS.get(complexity, 1.0)
+    target_count = int(len(roles) * multiplier)
+
+    # Get agent templates, stopping as soon as target_count are found
+    templates = (template for template in map(_catalog().all.get, roles) if template)
+
+    # islice, like tuple slicing, simply yields everything when target_count is larger
+    return tuple(islice(templates, target_count))
 
 
 class AgentSkillsLibrary:
     """Library of predefined agent templates"""
 
     @staticmethod
-    def get_research_agents() -> Dict[AgentRole, AgentTemplate]:
+    def get_research_agents() -> Mapping[AgentRole, AgentTemplate]:
         """Get all research-focused agent templates"""
-        return {
-            AgentRole.RESEARCH_SPECIALIST: AgentTemplate(
-                role=AgentRole.RESEARCH_SPECIALIST,
-                name="Research Specialist",
-                description="Deep-dive research on specific topics with academic rigor",
-                skills=[
-                    AgentSkill(
-                        name="Literature Review",
-                        description="Comprehensive review of academic and industry literature",
-                        expertise_areas=["Academic papers", "Industry reports", "Technical docs"],
-                        tools=["Web search", "Academic databases", "Citation tracking"],
-                        output_types=["Research summaries", "Bibliographies", "State-of-the-art analysis"]
-                    ),
-                    AgentSkill(
-                        name="Data Collection",
-                        description="Systematic collection of relevant data and sources",
-                        expertise_areas=["Primary sources", "Data extraction", "Survey design"],
-                        tools=["APIs", "Web scraping", "Database queries"],
-                        output_types=["Datasets", "Source lists", "Data reports"]
-                    ),
-                    AgentSkill(
-                        name="Synthesis",
-                        description="Combining multiple sources into coherent insights",
-                        expertise_areas=["Pattern recognition", "Trend analysis", "Critical thinking"],
-                        tools=["Analysis frameworks", "Visualization"],
-                        output_types=["Executive summaries", "Insight reports"]
-                    )
-                ],
-                primary_focus="In-depth research and analysis",
-                expertise_level="expert",
-                optimal_team_size=5,
-                works_best_with=[AgentRole.DATA_ANALYST, AgentRole.TECHNICAL_WRITER]
-            ),
-
-            AgentRole.MARKET_ANALYST: AgentTemplate(
-                role=AgentRole.MARKET_ANALYST,
-                name="Market Analyst",
-                description="Competitive intelligence and market research",
-                skills=[
-                    AgentSkill(
-                        name="Competitive Analysis",
-                        description="In-depth analysis of competitors and market positioning",
-                        expertise_areas=["Competitor profiling", "SWOT analysis", "Market share"],
-                        tools=["Market data", "Financial reports", "Customer reviews"],
-                        output_types=["Competitive matrices", "Market reports"]
-                    ),
-                    AgentSkill(
-                        name="Trend Forecasting",
-                        description="Predicting market trends and opportunities",
-                        expertise_areas=["Trend analysis", "Forecasting", "Scenario planning"],
-                        tools=["Statistical models", "Industry data"],
-                        output_types=["Trend reports", "Forecasts", "Opportunity analysis"]
-                    )
-                ],
-                primary_focus="Market intelligence and competitive analysis",
-                expertise_level="senior",
-                optimal_team_size=3,
-                works_best_with=[AgentRole.BUSINESS_ANALYST, AgentRole.FINANCIAL_ANALYST]
-            )
-        }
+        return _catalog().research
 
     @staticmethod
-    def get_development_agents() -> Dict[AgentRole, AgentTemplate]:
+    def get_development_agents() -> Mapping[AgentRole, AgentTemplate]:
         """Get all development-focused agent templates"""
-        return {
-            AgentRole.SOFTWARE_ARCHITECT: AgentTemplate(
-                role=AgentRole.SOFTWARE_ARCHITECT,
-                name="Software Architect",
-                description="System design and architectural decision-making",
-                skills=[
-                    AgentSkill(
-                        name="Architecture Design",
-                        description="Designing scalable, maintainable system architectures",
-                        expertise_areas=["Microservices", "Monoliths", "Serverless", "Event-driven"],
-                        tools=["UML", "Architecture diagrams", "Design patterns"],
-                        output_types=["Architecture diagrams", "Design docs", "Tech specs"]
-                    ),
-                    AgentSkill(
-                        name="Technology Selection",
-                        description="Choosing optimal technologies for requirements",
-                        expertise_areas=["Technology evaluation", "Trade-off analysis"],
-                        tools=["Proof of concepts", "Benchmarking"],
-                        output_types=["Technology recommendations", "Comparison matrices"]
-                    ),
-                    AgentSkill(
-                        name="Scalability Planning",
-                        description="Ensuring systems can scale effectively",
-                        expertise_areas=["Load balancing", "Caching", "Database sharding"],
-                        tools=["Performance modeling", "Capacity planning"],
-                        output_types=["Scalability plans", "Performance specs"]
-                    )
-                ],
-                primary_focus="High-level system architecture and technical strategy",
-                expertise_level="expert",
-                optimal_team_size=2,
-                works_best_with=[AgentRole.BACKEND_DEVELOPER, AgentRole.DEVOPS_ENGINEER]
-            ),
-
-            AgentRole.SECURITY_ENGINEER: AgentTemplate(
-                role=AgentRole.SECURITY_ENGINEER,
-                name="Security Engineer",
-                description="Application and infrastructure security",
-                skills=[
-                    AgentSkill(
-                        name="Threat Modeling",
-                        description="Identifying and mitigating security threats",
-                        expertise_areas=["STRIDE", "Attack trees", "Risk assessment"],
-                        tools=["Threat modeling tools", "CVSS scoring"],
-                        output_types=["Threat models", "Risk registers"]
-                    ),
-                    AgentSkill(
-                        name="Security Architecture",
-                        description="Designing secure systems and defenses",
-                        expertise_areas=["Defense in depth", "Zero trust", "Encryption"],
-                        tools=["Security frameworks", "Compliance standards"],
-                        output_types=["Security architectures", "Security requirements"]
-                    ),
-                    AgentSkill(
-                        name="Incident Response",
-                        description="Responding to security incidents",
-                        expertise_areas=["Forensics", "Containment", "Recovery"],
-                        tools=["SIEM", "Log analysis", "Forensic tools"],
-                        output_types=["Incident reports", "Remediation plans"]
-                    )
-                ],
-                primary_focus="Security architecture and threat mitigation",
-                expertise_level="expert",
-                optimal_team_size=3,
-                works_best_with=[AgentRole.SECURITY_AUDITOR, AgentRole.PENETRATION_TESTER]
-            )
-        }
+        return _catalog().development
 
     @staticmethod
-    def get_security_agents() -> Dict[AgentRole, AgentTemplate]:
+    def get_security_agents() -> Mapping[AgentRole, AgentTemplate]:
         """Get all security-focused agent templates"""
-        return {
-            AgentRole.SECURITY_AUDITOR: AgentTemplate(
-                role=AgentRole.SECURITY_AUDITOR,
-                name="Security Auditor",
-                description="Code review and vulnerability assessment",
-                skills=[
-                    AgentSkill(
-                        name="Code Security Review",
-                        description="Analyzing code for security vulnerabilities",
-                        expertise_areas=["OWASP Top 10", "CWE Top 25", "Secure coding"],
-                        tools=["SAST", "DAST", "Code scanners"],
-                        output_types=["Vulnerability reports", "Remediation guides"]
-                    ),
-                    AgentSkill(
-                        name="Compliance Audit",
-                        description="Ensuring compliance with security standards",
-                        expertise_areas=["PCI-DSS", "HIPAA", "SOC 2", "ISO 27001"],
-                        tools=["Compliance frameworks", "Audit tools"],
-                        output_types=["Compliance reports", "Gap analysis"]
-                    )
-                ],
-                primary_focus="Security auditing and compliance",
-                expertise_level="senior",
-                optimal_team_size=4,
-                works_best_with=[AgentRole.SECURITY_ENGINEER, AgentRole.COMPLIANCE_OFFICER]
-            ),
-
-            AgentRole.PENETRATION_TESTER: AgentTemplate(
-                role=AgentRole.PENETRATION_TESTER,
-                name="Penetration Tester",
-                description="Offensive security and exploit detection",
-                skills=[
-                    AgentSkill(
-                        name="Vulnerability Exploitation",
-                        description="Identifying and exploiting security vulnerabilities",
-                        expertise_areas=["SQL injection", "XSS", "CSRF", "Authentication bypass"],
-                        tools=["Burp Suite", "Metasploit", "Custom exploits"],
-                        output_types=["Penetration test reports", "Exploit POCs"]
-                    ),
-                    AgentSkill(
-                        name="Red Team Operations",
-                        description="Simulating advanced persistent threats",
-                        expertise_areas=["Social engineering", "Lateral movement", "Privilege escalation"],
-                        tools=["C2 frameworks", "Reconnaissance tools"],
-                        output_types=["Attack narratives", "Security recommendations"]
-                    )
-                ],
-                primary_focus="Offensive security and vulnerability exploitation",
-                expertise_level="expert",
-                optimal_team_size=2,
-                works_best_with=[AgentRole.SECURITY_AUDITOR, AgentRole.SECURITY_ENGINEER]
-            )
-        }
+        return _catalog().security
 
     @staticmethod
-    def get_content_agents() -> Dict[AgentRole, AgentTemplate]:
+    def get_content_agents() -> Mapping[AgentRole, AgentTemplate]:
         """Get all content-focused agent templates"""
-        return {
-            AgentRole.TECHNICAL_WRITER: AgentTemplate(
-                role=AgentRole.TECHNICAL_WRITER,
-                name="Technical Writer",
-                description="Technical documentation and developer guides",
-                skills=[
-                    AgentSkill(
-                        name="API Documentation",
-                        description="Writing comprehensive API documentation",
-                        expertise_areas=["REST", "GraphQL", "OpenAPI", "SDK docs"],
-                        tools=["Swagger", "Postman", "Documentation generators"],
-                        output_types=["API references", "Integration guides"]
-                    ),
-                    AgentSkill(
-                        name="User Documentation",
-                        description="Creating user-friendly documentation",
-                        expertise_areas=["User guides", "Tutorials", "Troubleshooting"],
-                        tools=["Markdown", "Documentation platforms"],
-                        output_types=["User manuals", "Quick start guides", "FAQs"]
-                    )
-                ],
-                primary_focus="Clear, comprehensive technical documentation",
-                expertise_level="senior",
-                optimal_team_size=3,
-                works_best_with=[AgentRole.SOFTWARE_ARCHITECT, AgentRole.BACKEND_DEVELOPER]
-            )
-        }
+        return _catalog().content
 
     @staticmethod
-    def get_all_agents() -> Dict[AgentRole, AgentTemplate]:
+    def get_all_agents() -> Mapping[AgentRole, AgentTemplate]:
         """Get all available agent templates"""
-        all_agents = {}
-        all_agents.update(AgentSkillsLibrary.get_research_agents())
-        all_agents.update(AgentSkillsLibrary.get_development_agents())
-        all_agents.update(AgentSkillsLibrary.get_security_agents())
-        all_agents.update(AgentSkillsLibrary.get_content_agents())
-        return all_agents
+        return _catalog().all
 
     @staticmethod
     def get_agent_by_role(role: AgentRole) -> Optional[AgentTemplate]:
         """Get specific agent template by role"""
-        all_agents = AgentSkillsLibrary.get_all_agents()
-        return all_agents.get(role)
+        return _catalog().all.get(role)
 
     @staticmethod
-    def recommend_agents_for_task(task_type: str, complexity: str = "medium") -> List[AgentTemplate]:
+    def get_collaborators(role: AgentRole) -> Tuple[AgentRole, ...]:
+        """Get the roles whose templates list this role in works_best_with"""
+        return _catalog().collaborators.get(role, ())
+
+    @staticmethod
+    def recommend_agents_for_task(
+        task_type: Union[TaskType, str],
+        complexity: str = "medium"
+    ) -> List[AgentTemplate]:
         """Recommend agents based on task type and complexity"""
 
-        recommendations = {
-            "security_audit": [
-                AgentRole.SECURITY_AUDITOR,
-                AgentRole.PENETRATION_TESTER,
-                AgentRole.SECURITY_ENGINEER,
-                AgentRole.COMPLIANCE_OFFICER
-            ],
-            "research": [
-                AgentRole.RESEARCH_SPECIALIST,
-                AgentRole.DATA_ANALYST,
-                AgentRole.FACT_CHECKER,
-                AgentRole.TECHNICAL_WRITER
-            ],
-            "software_development": [
-                AgentRole.SOFTWARE_ARCHITECT,
-                AgentRole.BACKEND_DEVELOPER,
-                AgentRole.FRONTEND_DEVELOPER,
-                AgentRole.QA_ENGINEER,
-                AgentRole.DEVOPS_ENGINEER
-            ],
-            "market_analysis": [
-                AgentRole.MARKET_ANALYST,
-                AgentRole.BUSINESS_ANALYST,
-                AgentRole.FINANCIAL_ANALYST,
-                AgentRole.DATA_ANALYST
-            ]
-        }
-
-        # Get recommended roles
-        roles = recommendations.get(task_type, [])
-
-        # Adjust count based on complexity
-        complexity_multipliers = {
-            "low": 0.5,
-            "medium": 1.0,
-            "high": 1.5,
-            "extreme": 2.0
-        }
-
-        multiplier = complexity_multipliers.get(complexity, 1.0)
-        target_count = int(len(roles) * multiplier)
-
-        # Get agent templates
-        all_agents = AgentSkillsLibrary.get_all_agents()
-        recommended = [all_agents[role] for role in roles if role in all_agents]
-
-        return recommended[:target_count] if target_count < len(recommended) else recommended
+        return list(_recommended_templates(task_type, complexity))
+
+    @staticmethod
+    def recommend_agents_bulk(
+        task_types: Sequence[Union[TaskType, str]],
+        complexities: Sequence[str]
+    ) -> List[List[AgentTemplate]]:
+        """Recommend agents for many (task_type, complexity) pairs at once"""
+        return [
+            list(templates)
+            for templates in map(_recommended_templates, task_types, complexities)
+        ]
 
 
 # Example usage
 if __name__ == "__main__":
     library = AgentSkillsLibrary()
+    # Collect the report and write it once rather than print line by line
+    out: List[str] = []
 
-    print("🎯 Agent Skills Library\n")
-    print("=" * 80)
+    out.append("🎯 Agent Skills Library\n")
+    out.append("=" * 80)
 
     # Get all agents
     all_agents = library.get_all_agents()
-    print(f"\n📋 Total Available Agent Templates: {len(all_agents)}\n")
+    out.append(f"\n📋 Total Available Agent Templates: {len(all_agents)}\n")
 
     # Show research agents
-    print("🔬 Research Agents:")
-    print("-" * 80)
+    out.append("🔬 Research Agents:")
+    out.append("-" * 80)
     for role, template in library.get_research_agents().items():
-        print(f"\n{template.name}")
-        print(f"  Role: {role.value}")
-        print(f"  Focus: {template.primary_focus}")
-        print(f"  Expertise: {template.expertise_level}")
-        print(f"  Optimal Team Size: {template.optimal_team_size}")
-        print(f"  Skills: {len(template.skills)}")
+        out.append(f"\n{template.name}")
+        out.append(f"  Role: {role.value}")
+        out.append(f"  Focus: {template.primary_focus}")
+        out.append(f"  Expertise: {template.expertise_level}")
+        out.append(f"  Optimal Team Size: {template.optimal_team_size}")
+        out.append(f"  Skills: {len(template.skills)}")
 
     # Show security agents
-    print("\n\n🛡️ Security Agents:")
-    print("-" * 80)
+    out.append("\n\n🛡️ Security Agents:")
+    out.append("-" * 80)
     for role, template in library.get_security_agents().items():
-        print(f"\n{template.name}")
-        print(f"  Focus: {template.primary_focus}")
-        print(f"  Skills: {', '.join([s.name for s in template.skills])}")
+        out.append(f"\n{template.name}")
+        out.append(f"  Focus: {template.primary_focus}")
+        out.append(f"  Skills: {', '.join(map(attrgetter('name'), template.skills))}")
 
     # Get recommendations
-    print("\n\n💡 Agent Recommendations:")
-    print("-" * 80)
+    out.append("\n\n💡 Agent Recommendations:")
+    out.append("-" * 80)
 
-    print("\nFor: Security Audit (High Complexity)")
+    out.append("\nFor: Security Audit (High Complexity)")
     recommended = library.recommend_agents_for_task("security_audit", "high")
     for agent in recommended:
-        print(f"  • {agent.name} ({agent.expertise_level})")
+        out.append(f"  • {agent.name} ({agent.expertise_level})")
 
-    print("\nFor: Market Analysis (Medium Complexity)")
+    out.append("\nFor: Market Analysis (Medium Complexity)")
     recommended = library.recommend_agents_for_task("market_analysis", "medium")
     for agent in recommended:
-        print(f"  • {agent.name} ({agent.expertise_level})")
+        out.append(f"  • {agent.name} ({agent.expertise_level})")
+
+    out.append("\n" + "=" * 80)
 
-    print("\n" + "=" * 80)
+    sys.stdout.write("\n".join(out) + "\n")
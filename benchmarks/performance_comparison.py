@@ -6,8 +6,10 @@ Demonstrates the performance improvements of the production-grade client.
 
 import asyncio
 import time
-import statistics
-from typing import List
+from array import array
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Sequence, Tuple
 import sys
 import os
 
@@ -20,12 +22,143 @@ from core.observability import StructuredLogger
 logger = StructuredLogger("benchmark")
 
 
-async def benchmark_basic_client(iterations: int = 100) -> dict:
+class _P2Quantile:
+    """Streaming estimate of one quantile in O(1) memory (P-squared algorithm)."""
+
+    __slots__ = ("p", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, p: float):
+        self.p = p
+        self._heights: List[float] = []
+        self._positions: List[int] = []
+        self._desired: List[float] = []
+        self._increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def seed(self, ordered: Sequence[float]) -> None:
+        """Place the markers at the exact quantiles of at least five sorted samples."""
+        last = len(ordered) - 1
+        self._desired = [last * inc for inc in self._increments]
+
+        # Markers need strictly increasing positions, so marker i is kept
+        # within [i, last - 4 + i] before spreading out duplicates
+        positions = [
+            min(max(round(rank), i), last - 4 + i)
+            for i, rank in enumerate(self._desired)
+        ]
+        for i in range(1, 5):
+            positions[i] = max(positions[i], positions[i - 1] + 1)
+
+        self._positions = positions
+        self._heights = [ordered[i] for i in positions]
+
+    def add(self, x: float) -> None:
+        q = self._heights
+        n = self._positions
+
+        # Find the cell containing x, stretching the extremes if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Nudge the middle markers toward their desired positions
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def value(self) -> float:
+        return self._heights[2]
+
+
+class _LatencyStats:
+    """Running latency aggregates; finalizing is O(1) regardless of sample count."""
+
+    # Samples kept exactly before switching to the P-squared estimates
+    SEED_SIZE = 128
+
+    __slots__ = ("count", "mean", "min", "max", "_seed", "_quantiles")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        # One preallocated buffer, sorted once, seeds every estimator
+        self._seed = array("d", bytes(8 * self.SEED_SIZE))
+        self._quantiles = (_P2Quantile(0.50), _P2Quantile(0.95), _P2Quantile(0.99))
+
+    def add(self, latency_ms: float) -> None:
+        self.count += 1
+        self.mean += (latency_ms - self.mean) / self.count  # Welford update
+        if latency_ms < self.min:
+            self.min = latency_ms
+        if latency_ms > self.max:
+            self.max = latency_ms
+
+        if self.count > self.SEED_SIZE:
+            for quantile in self._quantiles:
+                quantile.add(latency_ms)
+        else:
+            self._seed[self.count - 1] = latency_ms
+            if self.count == self.SEED_SIZE:
+                ordered = sorted(self._seed)
+                for quantile in self._quantiles:
+                    quantile.seed(ordered)
+
+    def _percentiles(self) -> Tuple[float, ...]:
+        """p50, p95 and p99: estimated once seeded, exact (nearest rank) before."""
+        if self.count >= self.SEED_SIZE:
+            return tuple(quantile.value() for quantile in self._quantiles)
+        ordered = sorted(self._seed[:self.count])
+        last = self.count - 1
+        return tuple(ordered[round(quantile.p * last)] for quantile in self._quantiles)
+
+    def summary(self) -> dict:
+        """Latency fields of a benchmark result (all 0 when nothing succeeded)."""
+        if not self.count:
+            return dict.fromkeys(
+                ("average_latency_ms", "median_latency_ms", "p95_latency_ms",
+                 "p99_latency_ms", "min_latency_ms", "max_latency_ms"),
+                0
+            )
+        p50, p95, p99 = self._percentiles()
+        return {
+            "average_latency_ms": self.mean,
+            "median_latency_ms": p50,
+            "p95_latency_ms": p95,
+            "p99_latency_ms": p99,
+            "min_latency_ms": self.min,
+            "max_latency_ms": self.max
+        }
+
+
+async def benchmark_basic_client(iterations: int = 100, concurrency: int = 16) -> dict:
     """
     Benchmark basic client (simulated V1).
 
     Args:
         iterations: Number of requests to benchmark
+        concurrency: Number of requests in flight per wave
 
     Returns:
         Performance statistics
@@ -33,55 +166,59 @@ async def benchmark_basic_client(iterations: int = 100) -> dict:
     from kimi_client import KimiClient, ProviderType
 
     client = KimiClient(provider=ProviderType.OLLAMA)
-    latencies = []
+    latencies = _LatencyStats()
     errors = 0
 
-    logger.info(f"Starting V1 benchmark ({iterations} iterations)")
+    async def _one(i: int) -> None:
+        iter_start = time.perf_counter_ns()
 
-    start_time = time.time()
+        # Note: V1 doesn't have sophisticated error handling
+        # This is a simplified simulation
+        response = await client.chat([
+            {"role": "user", "content": f"Test message {i}"}
+        ])
 
-    for i in range(iterations):
-        try:
-            iter_start = time.time()
+        latencies.add((time.perf_counter_ns() - iter_start) / 1_000_000)
 
-            # Note: V1 doesn't have sophisticated error handling
-            # This is a simplified simulation
-            response = await client.chat([
-                {"role": "user", "content": f"Test message {i}"}
-            ])
+    logger.info(f"Starting V1 benchmark ({iterations} iterations, concurrency={concurrency})")
 
-            latency = (time.time() - iter_start) * 1000
-            latencies.append(latency)
+    start_time = time.perf_counter_ns()
 
-        except Exception as e:
-            errors += 1
-            logger.error(f"Request failed: {str(e)}")
+    # Submit requests in waves so their round-trips overlap
+    for wave_start in range(0, iterations, concurrency):
+        wave = range(wave_start, min(wave_start + concurrency, iterations))
+        outcomes = await asyncio.gather(*(_one(i) for i in wave), return_exceptions=True)
 
-    total_time = time.time() - start_time
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                errors += 1
+                logger.error(f"Request failed: {str(outcome)}")
+
+    total_time = (time.perf_counter_ns() - start_time) / 1_000_000_000
 
     return {
         "version": "V1 (Basic)",
         "total_requests": iterations,
-        "successful_requests": len(latencies),
+        "successful_requests": latencies.count,
         "failed_requests": errors,
         "total_time_seconds": total_time,
-        "average_latency_ms": statistics.mean(latencies) if latencies else 0,
-        "median_latency_ms": statistics.median(latencies) if latencies else 0,
-        "p95_latency_ms": statistics.quantiles(latencies, n=20)[18] if len(latencies) > 20 else 0,
-        "p99_latency_ms": statistics.quantiles(latencies, n=100)[98] if len(latencies) > 100 else 0,
-        "min_latency_ms": min(latencies) if latencies else 0,
-        "max_latency_ms": max(latencies) if latencies else 0,
-        "requests_per_second": len(latencies) / total_time if total_time > 0 else 0
+        **latencies.summary(),
+        "requests_per_second": latencies.count / total_time if total_time > 0 else 0
     }
 
 
-async def benchmark_production_client(iterations: int = 100, enable_cache: bool = True) -> dict:
+async def benchmark_production_client(
+    iterations: int = 100,
+    enable_cache: bool = True,
+    concurrency: int = 16
+) -> dict:
     """
     Benchmark production client (V2).
 
     Args:
         iterations: Number of requests to benchmark
         enable_cache: Enable caching
+        concurrency: Number of requests in flight per wave
 
     Returns:
         Performance statistics
@@ -94,37 +231,50 @@ async def benchmark_production_client(iterations: int = 100, enable_cache: bool
         enable_cache=enable_cache,
         enable_metrics=True
     ) as client:
-        latencies = []
+        latencies = _LatencyStats()
         cache_hits = 0
         errors = 0
+        # Resolved from the first response; every response has the same type
+        is_cached = None
 
-        logger.info(f"Starting V2 benchmark ({iterations} iterations, cache={'ON' if enable_cache else 'OFF'})")
+        async def _one(i: int) -> None:
+            nonlocal cache_hits, is_cached
+            iter_start = time.perf_counter_ns()
 
-        start_time = time.time()
+            # Repeat some queries to demonstrate cache effectiveness
+            message_num = i % 20  # Repeat every 20 messages
 
-        # Make same requests multiple times to benefit from cache
-        for i in range(iterations):
-            try:
-                iter_start = time.time()
+            response = await client.chat([
+                {"role": "user", "content": f"Test message {message_num}"}
+            ])
 
-                # Repeat some queries to demonstrate cache effectiveness
-                message_num = i % 20  # Repeat every 20 messages
+            latencies.add((time.perf_counter_ns() - iter_start) / 1_000_000)
 
-                response = await client.chat([
-                    {"role": "user", "content": f"Test message {message_num}"}
-                ])
+            if is_cached is None:
+                is_cached = attrgetter('cached') if hasattr(response, 'cached') else (lambda r: False)
+            if is_cached(response):
+                cache_hits += 1
 
-                latency = (time.time() - iter_start) * 1000
-                latencies.append(latency)
+        logger.info(
+            f"Starting V2 benchmark ({iterations} iterations, concurrency={concurrency}, "
+            f"cache={'ON' if enable_cache else 'OFF'})"
+        )
 
-                if hasattr(response, 'cached') and response.cached:
-                    cache_hits += 1
+        start_time = time.perf_counter_ns()
 
-            except Exception as e:
-                errors += 1
-                logger.error(f"Request failed: {str(e)}", exc_info=e)
+        # Make same requests multiple times to benefit from cache; waves run
+        # concurrently, and a repeated message lands in a later wave than its
+        # first occurrence as long as concurrency <= 20
+        for wave_start in range(0, iterations, concurrency):
+            wave = range(wave_start, min(wave_start + concurrency, iterations))
+            outcomes = await asyncio.gather(*(_one(i) for i in wave), return_exceptions=True)
+
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    errors += 1
+                    logger.error(f"Request failed: {str(outcome)}", exc_info=outcome)
 
-        total_time = time.time() - start_time
+        total_time = (time.perf_counter_ns() - start_time) / 1_000_000_000
 
         # Get metrics from client
         metrics = client.get_metrics()
@@ -132,18 +282,13 @@ async def benchmark_production_client(iterations: int = 100, enable_cache: bool
         return {
             "version": f"V2 (Production, Cache {'ON' if enable_cache else 'OFF'})",
             "total_requests": iterations,
-            "successful_requests": len(latencies),
+            "successful_requests": latencies.count,
             "failed_requests": errors,
             "cache_hits": cache_hits,
             "cache_hit_rate": cache_hits / iterations if iterations > 0 else 0,
             "total_time_seconds": total_time,
-            "average_latency_ms": statistics.mean(latencies) if latencies else 0,
-            "median_latency_ms": statistics.median(latencies) if latencies else 0,
-            "p95_latency_ms": statistics.quantiles(latencies, n=20)[18] if len(latencies) > 20 else 0,
-            "p99_latency_ms": statistics.quantiles(latencies, n=100)[98] if len(latencies) > 100 else 0,
-            "min_latency_ms": min(latencies) if latencies else 0,
-            "max_latency_ms": max(latencies) if latencies else 0,
-            "requests_per_second": len(latencies) / total_time if total_time > 0 else 0,
+            **latencies.summary(),
+            "requests_per_second": latencies.count / total_time if total_time > 0 else 0,
             "metrics": metrics.dict() if metrics else None
         }
 
@@ -170,7 +315,7 @@ async def benchmark_error_recovery(failure_rate: float = 0.3) -> dict:
     recovered = 0
     failed = 0
 
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
 
     for i in range(iterations):
         try:
@@ -182,7 +327,7 @@ async def benchmark_error_recovery(failure_rate: float = 0.3) -> dict:
         except Exception:
             failed += 1
 
-    total_time = time.time() - start_time
+    total_time = (time.perf_counter_ns() - start_time) / 1_000_000_000
 
     mock_stats = mock.get_stats()
 
@@ -198,6 +343,20 @@ async def benchmark_error_recovery(failure_rate: float = 0.3) -> dict:
     }
 
 
+# Result fields that are headings or nested data rather than table rows
+_UNFORMATTED_KEYS = frozenset(("version", "test", "metrics"))
+
+
+@lru_cache(maxsize=None)
+def _float_format(key: str) -> str:
+    """Format string for a float result field, derived once per key name."""
+    if 'rate' in key or 'percent' in key:
+        return "{:>10.2%}"
+    if 'time' in key or 'latency' in key:
+        return "{:>10.2f} s" if 'seconds' in key else "{:>10.2f} ms"
+    return "{:>10.2f}"
+
+
 def print_benchmark_results(results: List[dict]):
     """Print benchmark results in a formatted table."""
     print("\n" + "=" * 100)
@@ -211,16 +370,11 @@ def print_benchmark_results(results: List[dict]):
 
         # Format results
         for key, value in result.items():
-            if key in ['version', 'test', 'metrics']:
+            if key in _UNFORMATTED_KEYS:
                 continue
 
             if isinstance(value, float):
-                if 'rate' in key or 'percent' in key:
-                    print(f"  {key:30s}: {value:>10.2%}")
-                elif 'time' in key or 'latency' in key:
-                    print(f"  {key:30s}: {value:>10.2f} {'s' if 'seconds' in key else 'ms'}")
-                else:
-                    print(f"  {key:30s}: {value:>10.2f}")
+                print(f"  {key:30s}: {_float_format(key).format(value)}")
             else:
                 print(f"  {key:30s}: {value:>10}")
 
@@ -373,4 +527,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop is optional; fall back to the default event loop when missing
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
@@ -5,13 +5,50 @@ Advanced context management and augmentation for agent conversations
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
+import heapq
+import time
+from collections import Counter, OrderedDict, deque
+from itertools import chain, count, islice
+from operator import itemgetter
+from typing import Deque, List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 import json
 
-from rag.vector_store import RAGVectorStore, Document, VectorStoreType
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from rag.vector_store import RAGVectorStore, Document, SearchResult, VectorStoreType
+
+
+# Timestamps are integer nanoseconds since the Unix epoch (UTC), as from time.time_ns()
+_EPOCH = datetime(1970, 1, 1)
+_NS_PER_MINUTE = 60 * 1_000_000_000
+
+# Recent knowledge searches are reused for up to a minute
+_SEARCH_CACHE_SIZE = 128
+_SEARCH_CACHE_TTL_NS = 60 * 1_000_000_000
+
+
+def _to_ns(dt: datetime) -> int:
+    """Convert a naive UTC datetime to epoch nanoseconds"""
+    return (dt - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def _from_ns(ns: int) -> datetime:
+    """Convert epoch nanoseconds to a naive UTC datetime"""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def _as_ns(value: Union[datetime, float]) -> int:
+    """Convert a naive UTC datetime or epoch seconds to epoch nanoseconds"""
+    if isinstance(value, datetime):
+        return _to_ns(value)
+    return round(value * 1_000_000_000)
 
 
 class ContextType(Enum):
@@ -24,22 +61,76 @@ class ContextType(Enum):
     TOOL = "tool"
 
 
-@dataclass
+# Members bound once for the per-entry and per-query paths
+_CT_CONVERSATION = ContextType.CONVERSATION
+_CT_KNOWLEDGE = ContextType.KNOWLEDGE
+_CT_TASK = ContextType.TASK
+
+# (member, value) pairs in definition order
+_CONTEXT_TYPE_VALUES = tuple((ctx_type, ctx_type.value) for ctx_type in ContextType)
+
+
+@dataclass(slots=True, init=False)
 class ContextEntry:
-    """Single context entry"""
+    """Single context entry
+
+    Times are stored as epoch nanoseconds (timestamp_ns, expires_at_ns).
+    timestamp and expires_at are still accepted, as naive UTC datetimes or
+    epoch seconds, and read back as naive UTC datetimes.
+    """
     id: str
     type: ContextType
     content: str
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=datetime.utcnow)
-    relevance_score: float = 1.0
-    expires_at: Optional[datetime] = None
+    metadata: Dict[str, Any]
+    timestamp_ns: int
+    relevance_score: float
+    expires_at_ns: Optional[int]
+    # Rough token estimate, computed once since content is not reassigned
+    _token_count: int = field(default=0, init=False, repr=False, compare=False)
 
-    def is_expired(self) -> bool:
-        """Check if context has expired"""
-        if self.expires_at:
-            return datetime.utcnow() > self.expires_at
-        return False
+    def __init__(
+        self,
+        id: str,
+        type: ContextType,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[Union[datetime, float]] = None,
+        relevance_score: float = 1.0,
+        expires_at: Optional[Union[datetime, float]] = None,
+        *,
+        timestamp_ns: Optional[int] = None,
+        expires_at_ns: Optional[int] = None
+    ):
+        self.id = id
+        self.type = type
+        self.content = content
+        self.metadata = {} if metadata is None else metadata
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns() if timestamp is None else _as_ns(timestamp)
+        self.timestamp_ns = timestamp_ns
+        self.relevance_score = relevance_score
+        if expires_at_ns is None and expires_at is not None:
+            expires_at_ns = _as_ns(expires_at)
+        self.expires_at_ns = expires_at_ns
+        self._token_count = len(content.split())
+
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a naive UTC datetime"""
+        return _from_ns(self.timestamp_ns)
+
+    @property
+    def expires_at(self) -> Optional[datetime]:
+        """Expiry time as a naive UTC datetime (None = never expires)"""
+        if self.expires_at_ns is None:
+            return None
+        return _from_ns(self.expires_at_ns)
+
+    def is_expired(self, now_ns: Optional[int] = None) -> bool:
+        """Check if context has expired (now_ns lets callers share one clock read)"""
+        if self.expires_at_ns is None:
+            return False
+        return (time.time_ns() if now_ns is None else now_ns) > self.expires_at_ns
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -51,8 +142,14 @@ class ContextEntry:
             "relevance_score": self.relevance_score
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to_dict() as UTF-8 JSON, preferring orjson when installed"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self.to_dict(), ensure_ascii=False).encode()
 
-@dataclass
+
+@dataclass(slots=True, init=False)
 class ContextWindow:
     """
     Sliding context window with priority and relevance
@@ -62,25 +159,79 @@ class ContextWindow:
     - Relevance: Semantically relevant context
     - Importance: Explicitly marked important context
     - Type: Different types of context (conversation, knowledge, etc.)
+
+    entries can be passed to the constructor or assigned, but reading it
+    returns a snapshot list: add entries with add(), not entries.append().
     """
-    max_tokens: int = 8000
-    max_entries: int = 50
-    entries: List[ContextEntry] = field(default_factory=list)
+    max_tokens: int
+    max_entries: int
+    # Min-heap of (relevance_score, timestamp_ns, insertion_seq, entry); the
+    # root is the least relevant, then oldest, entry and is evicted first
+    _heap: List[Tuple[float, int, int, ContextEntry]] = field(repr=False)
+    _seq: Iterator[int] = field(repr=False, compare=False)
+    _expiring: int = field(repr=False, compare=False)  # entries with expires_at_ns
+
+    def __init__(
+        self,
+        max_tokens: int = 8000,
+        max_entries: int = 50,
+        entries: Optional[Iterable[ContextEntry]] = None
+    ):
+        self.max_tokens = max_tokens
+        self.max_entries = max_entries
+        self._heap = []
+        self._seq = count()
+        self._expiring = 0
+        if entries is not None:
+            self.entries = entries
+
+    @property
+    def entries(self) -> List[ContextEntry]:
+        """Unexpired entries in insertion order"""
+        now_ns = time.time_ns()
+        return [
+            item[3] for item in sorted(self._heap, key=itemgetter(2))
+            if not item[3].is_expired(now_ns)
+        ]
+
+    @entries.setter
+    def entries(self, entries: Iterable[ContextEntry]):
+        """Replace all entries, keeping their order for recency ties"""
+        seq = self._seq
+        self._heap = [
+            (entry.relevance_score, entry.timestamp_ns, next(seq), entry)
+            for entry in entries
+        ]
+        heapq.heapify(self._heap)
+        self._expiring = sum(item[3].expires_at_ns is not None for item in self._heap)
+        if len(self._heap) > self.max_entries:
+            self._cleanup()
 
     def add(self, entry: ContextEntry):
         """Add entry to context window"""
-        self.entries.append(entry)
-        self._cleanup()
+        heapq.heappush(
+            self._heap,
+            (entry.relevance_score, entry.timestamp_ns, next(self._seq), entry)
+        )
+        if entry.expires_at_ns is not None:
+            self._expiring += 1
+        if len(self._heap) > self.max_entries:
+            self._cleanup()
 
     def _cleanup(self):
         """Remove expired and low-priority entries"""
-        # Remove expired
-        self.entries = [e for e in self.entries if not e.is_expired()]
+        # Expired entries are skipped on read; purge them before evicting live ones
+        if self._expiring:
+            now_ns = time.time_ns()
+            self._heap = [item for item in self._heap if not item[3].is_expired(now_ns)]
+            heapq.heapify(self._heap)
+            self._expiring = sum(item[3].expires_at_ns is not None for item in self._heap)
 
         # If over limit, remove lowest relevance entries
-        if len(self.entries) > self.max_entries:
-            self.entries.sort(key=lambda e: e.relevance_score, reverse=True)
-            self.entries = self.entries[:self.max_entries]
+        while len(self._heap) > self.max_entries:
+            evicted = heapq.heappop(self._heap)[3]
+            if evicted.expires_at_ns is not None:
+                self._expiring -= 1
 
     def get_context(
         self,
@@ -89,25 +240,24 @@ class ContextWindow:
     ) -> List[ContextEntry]:
         """Get context entries, filtered and prioritized"""
         max_tokens = max_tokens or self.max_tokens
+        now_ns = time.time_ns()
 
-        # Filter by type if specified
-        if context_types:
-            entries = [e for e in self.entries if e.type in context_types]
-        else:
-            entries = self.entries.copy()
+        # Filter out expired entries, and by type if specified
+        items = [
+            item for item in self._heap
+            if not item[3].is_expired(now_ns)
+            and (not context_types or item[3].type in context_types)
+        ]
 
-        # Sort by relevance and recency
-        entries.sort(
-            key=lambda e: (e.relevance_score, e.timestamp),
-            reverse=True
-        )
+        # Sort by relevance and recency (ties keep insertion order)
+        items.sort(key=_context_order)
 
         # Trim to token limit (approximate)
         # This is a simplified token counting
         result = []
         total_tokens = 0
-        for entry in entries:
-            entry_tokens = len(entry.content.split())  # Rough estimate
+        for *_, entry in items:
+            entry_tokens = entry._token_count
             if total_tokens + entry_tokens > max_tokens:
                 break
             result.append(entry)
@@ -118,9 +268,22 @@ class ContextWindow:
     def clear(self, context_type: Optional[ContextType] = None):
         """Clear context entries"""
         if context_type:
-            self.entries = [e for e in self.entries if e.type != context_type]
+            self._heap = [item for item in self._heap if item[3].type != context_type]
+            heapq.heapify(self._heap)
+            self._expiring = sum(item[3].expires_at_ns is not None for item in self._heap)
         else:
-            self.entries.clear()
+            self._heap.clear()
+            self._expiring = 0
+
+
+def _context_order(item: Tuple[float, int, int, ContextEntry]) -> Tuple[float, int, int]:
+    """Sort key for heap items: most relevant, then newest, then first inserted"""
+    return -item[0], -item[1], item[2]
+
+
+def _section(title: str, lines: Iterable[str]) -> Iterator[str]:
+    """Prompt section lines: title, body, then a blank separator"""
+    return chain((title,), lines, ("",))
 
 
 class ContextAugmentationEngine:
@@ -144,12 +307,17 @@ class ContextAugmentationEngine:
             store_type=VectorStoreType.IN_MEMORY
         )
         self.max_context_tokens = max_context_tokens
-        self.conversation_history: List[Dict[str, str]] = []
+        # Keeps the last 10 messages; older ones fall off as new ones arrive
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=10)
+        # Recent search results: (query, k) -> (store version, monotonic_ns when fetched, results)
+        self._search_cache: OrderedDict[
+            Tuple[str, int], Tuple[int, int, List[SearchResult]]
+        ] = OrderedDict()
 
     async def augment_query(
         self,
         query: str,
-        conversation_history: Optional[List[Dict[str, str]]] = None,
+        conversation_history: Optional[Sequence[Dict[str, str]]] = None,
         retrieve_knowledge: bool = True,
         k_retrieved: int = 3
     ) -> Tuple[str, List[ContextEntry]]:
@@ -165,31 +333,80 @@ class ContextAugmentationEngine:
         Returns:
             Tuple of (augmented_prompt, context_entries)
         """
+        results = await self._search(query, k_retrieved) if retrieve_knowledge else ()
+        return self._augment(query, conversation_history, results)
+
+    async def augment_queries(
+        self,
+        queries: Sequence[str],
+        conversation_history: Optional[Sequence[Dict[str, str]]] = None,
+        retrieve_knowledge: bool = True,
+        k_retrieved: int = 3
+    ) -> List[Tuple[str, List[ContextEntry]]]:
+        """
+        Augment several queries against the same conversation history
+
+        Knowledge searches for all queries run concurrently.
+
+        Args:
+            queries: User queries
+            conversation_history: Recent conversation
+            retrieve_knowledge: Whether to retrieve from knowledge base
+            k_retrieved: Number of knowledge entries to retrieve per query
+
+        Returns:
+            One (augmented_prompt, context_entries) tuple per query, in order
+        """
+        if len(queries) == 1:
+            return [await self.augment_query(
+                queries[0], conversation_history, retrieve_knowledge, k_retrieved
+            )]
+
+        if retrieve_knowledge:
+            results_per_query = await asyncio.gather(*(
+                self._search(query, k_retrieved) for query in queries
+            ))
+        else:
+            results_per_query = [()] * len(queries)
+
+        return [
+            self._augment(query, conversation_history, results)
+            for query, results in zip(queries, results_per_query)
+        ]
+
+    def _augment(
+        self,
+        query: str,
+        conversation_history: Optional[Sequence[Dict[str, str]]],
+        results: Sequence[SearchResult]
+    ) -> Tuple[str, List[ContextEntry]]:
+        """Build context entries and the augmented prompt from retrieved knowledge"""
         context_entries = []
 
         # 1. Add conversation history
         if conversation_history:
-            for i, msg in enumerate(conversation_history[-5:]):  # Last 5 messages
+            base_ns = time.time_ns()
+            # Last 5 messages; islice works for lists and deques alike
+            recent = islice(conversation_history, max(len(conversation_history) - 5, 0), None)
+            for i, msg in enumerate(recent):
                 context_entries.append(ContextEntry(
                     id=f"conv_{i}",
-                    type=ContextType.CONVERSATION,
+                    type=_CT_CONVERSATION,
                     content=f"{msg['role']}: {msg['content']}",
                     relevance_score=0.8,
-                    timestamp=datetime.utcnow() - timedelta(minutes=5-i)
+                    timestamp_ns=base_ns - (5 - i) * _NS_PER_MINUTE
                 ))
 
-        # 2. Retrieve relevant knowledge (RAG)
-        if retrieve_knowledge:
-            results = await self.vector_store.search(query, k=k_retrieved)
-            for i, result in enumerate(results):
-                context_entries.append(ContextEntry(
-                    id=f"knowledge_{i}",
-                    type=ContextType.KNOWLEDGE,
-                    content=result.document.content,
-                    metadata=result.document.metadata,
-                    relevance_score=result.score,
-                    timestamp=result.document.timestamp
-                ))
+        # 2. Add retrieved knowledge (RAG)
+        for i, result in enumerate(results):
+            context_entries.append(ContextEntry(
+                id=f"knowledge_{i}",
+                type=_CT_KNOWLEDGE,
+                content=result.document.content,
+                metadata=result.document.metadata,
+                relevance_score=result.score,
+                timestamp_ns=_to_ns(result.document.timestamp)
+            ))
 
         # 3. Build augmented prompt
         augmented_prompt = self._build_prompt(query, context_entries)
@@ -202,45 +419,85 @@ class ContextAugmentationEngine:
         context_entries: List[ContextEntry]
     ) -> str:
         """Build augmented prompt with context"""
-        prompt_parts = []
-
-        # Group by type
-        by_type: Dict[ContextType, List[ContextEntry]] = {}
+        # Bucket the rendered types by identity rather than hashing each
+        # member (Enum.__hash__ runs in Python); other types are not rendered
+        conversation: List[ContextEntry] = []
+        knowledge: List[ContextEntry] = []
+        task: List[ContextEntry] = []
         for entry in context_entries:
-            if entry.type not in by_type:
-                by_type[entry.type] = []
-            by_type[entry.type].append(entry)
+            ctx_type = entry.type
+            if ctx_type is _CT_CONVERSATION:
+                conversation.append(entry)
+            elif ctx_type is _CT_KNOWLEDGE:
+                knowledge.append(entry)
+            elif ctx_type is _CT_TASK:
+                task.append(entry)
+
+        # Each section is lazily chained as title, lines, blank separator
+        sections = []
 
         # Add conversation history
-        if ContextType.CONVERSATION in by_type:
-            prompt_parts.append("# Recent Conversation")
-            for entry in by_type[ContextType.CONVERSATION]:
-                prompt_parts.append(entry.content)
-            prompt_parts.append("")
+        if conversation:
+            sections.append(_section(
+                "# Recent Conversation",
+                (entry.content for entry in conversation)
+            ))
 
         # Add knowledge context
-        if ContextType.KNOWLEDGE in by_type:
-            prompt_parts.append("# Relevant Knowledge")
-            for entry in by_type[ContextType.KNOWLEDGE]:
-                prompt_parts.append(f"- {entry.content}")
-            prompt_parts.append("")
+        if knowledge:
+            sections.append(_section(
+                "# Relevant Knowledge",
+                (f"- {entry.content}" for entry in knowledge)
+            ))
 
         # Add task context
-        if ContextType.TASK in by_type:
-            prompt_parts.append("# Task Context")
-            for entry in by_type[ContextType.TASK]:
-                prompt_parts.append(entry.content)
-            prompt_parts.append("")
+        if task:
+            sections.append(_section(
+                "# Task Context",
+                (entry.content for entry in task)
+            ))
 
         # Add query
-        prompt_parts.append("# Current Query")
-        prompt_parts.append(query)
+        sections.append(("# Current Query", query))
 
-        return "\n".join(prompt_parts)
+        return "\n".join(chain.from_iterable(sections))
+
+    async def _search(self, query: str, k: int) -> Sequence[SearchResult]:
+        """
+        Search the vector store, reusing results for recently seen (query, k)
+
+        Cached results are dropped after _SEARCH_CACHE_TTL_NS or as soon as
+        the store changes (its version moves), including changes made on
+        vector_store directly rather than through add_knowledge.
+        """
+        if k <= 0:
+            return ()
+
+        key = (query, k)
+        # Read before awaiting, so a change made mid-search marks the result stale
+        version = self.vector_store.version
+        now_ns = time.monotonic_ns()
+        cached = self._search_cache.get(key)
+        if (
+            cached is not None
+            and cached[0] == version
+            and now_ns - cached[1] < _SEARCH_CACHE_TTL_NS
+        ):
+            self._search_cache.move_to_end(key)
+            return cached[2]
+
+        results = await self.vector_store.search(query, k=k)
+        self._search_cache[key] = (version, now_ns, results)
+        self._search_cache.move_to_end(key)
+        if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return results
 
     async def add_knowledge(self, documents: List[Document]):
         """Add knowledge documents to vector store"""
         await self.vector_store.add_documents(documents)
+        # New documents can change any query's top-k
+        self._search_cache.clear()
 
     def update_conversation(self, role: str, content: str):
         """Update conversation history"""
@@ -248,9 +505,6 @@ class ContextAugmentationEngine:
             "role": role,
             "content": content
         })
-        # Keep last 10 messages
-        if len(self.conversation_history) > 10:
-            self.conversation_history = self.conversation_history[-10:]
 
 
 class ContextManager:
@@ -295,16 +549,54 @@ class ContextManager:
             retrieve_knowledge=retrieve_knowledge
         )
 
+        return self._record_query(query, augmented_prompt, context_entries)
+
+    async def process_queries(
+        self,
+        queries: Sequence[str],
+        retrieve_knowledge: bool = True
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Process independent queries with full CAG, retrieving knowledge concurrently
+
+        Every query sees the current conversation history; callers record the
+        resulting messages afterwards, in order.
+
+        Returns:
+            One (augmented_prompt, context_metadata) tuple per query, in order
+        """
+        augmented = await self.augmentation_engine.augment_queries(
+            queries,
+            conversation_history=self.augmentation_engine.conversation_history,
+            retrieve_knowledge=retrieve_knowledge
+        )
+
+        return [
+            self._record_query(query, augmented_prompt, context_entries)
+            for query, (augmented_prompt, context_entries) in zip(queries, augmented)
+        ]
+
+    def _record_query(
+        self,
+        query: str,
+        augmented_prompt: str,
+        context_entries: List[ContextEntry]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Add a query's context to the window and build its metadata"""
         # Add to context window
         for entry in context_entries:
             self.context_window.add(entry)
 
-        # Build metadata
+        # Build metadata; distinct types are collected as members and
+        # reported by value in definition order
+        types_seen = {e.type for e in context_entries}
         metadata = {
             "session_id": self.session_id,
             "query": query,
             "context_entries": len(context_entries),
-            "context_types": list(set(e.type.value for e in context_entries)),
+            "context_types": [
+                value for ctx_type, value in _CONTEXT_TYPE_VALUES if ctx_type in types_seen
+            ],
             "total_context_length": len(augmented_prompt)
         }
 
@@ -325,12 +617,10 @@ class ContextManager:
     def get_context_summary(self) -> Dict[str, Any]:
         """Get summary of current context"""
         entries = self.context_window.get_context()
+        counts = Counter(e.type for e in entries)
         return {
             "total_entries": len(entries),
-            "by_type": {
-                ctx_type.value: len([e for e in entries if e.type == ctx_type])
-                for ctx_type in ContextType
-            },
+            "by_type": {value: counts[ctx_type] for ctx_type, value in _CONTEXT_TYPE_VALUES},
             "conversation_turns": len(self.augmentation_engine.conversation_history),
             "session_id": self.session_id
         }
@@ -417,4 +707,11 @@ async def demo_cag():
 
 
 if __name__ == "__main__":
+    # uvloop is optional; fall back to the default event loop when missing
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(demo_cag())
@@ -7,67 +7,142 @@ Multi-level caching with TTL, LRU eviction, and intelligent cache warming.
 import asyncio
 import hashlib
 import json
+import sys
+import threading
 import time
 from typing import Optional, Any, Dict, Callable, TypeVar
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from collections import OrderedDict
-from functools import wraps
+from functools import lru_cache, wraps
+from logging import DEBUG
 import pickle
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .exceptions import CacheError, CacheMissError
 from .observability import StructuredLogger
 
 logger = StructuredLogger("cache")
+# Debug calls are gated on the level: building the f-string and entry costs more than a hit
 
 T = TypeVar('T')
 
+# Values whose size sys.getsizeof reports in full, without referents to walk
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+# Levels of containers/attributes followed, and children measured per container
+# (larger containers are extrapolated from an evenly spaced sample)
+_SIZE_DEPTH = 4
+_SIZE_SAMPLE = 16
+
 
-@dataclass
+def _approximate_size(value: Any, depth: int = _SIZE_DEPTH, seen: Optional[set] = None) -> int:
+    """
+    Approximate in-memory size of a value in bytes.
+
+    Sums sys.getsizeof over the value, its container items and instance
+    attributes, down to a fixed depth. Shared objects are counted once.
+    """
+    size = sys.getsizeof(value, 64)
+    if depth == 0 or isinstance(value, _ATOMIC_TYPES):
+        return size
+
+    if seen is None:
+        seen = set()
+    elif id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, dict):
+        children = [*value.keys(), *value.values()]
+    elif isinstance(value, (list, tuple)):
+        children = value
+    elif isinstance(value, (set, frozenset)):
+        children = list(value)
+    elif isinstance(getattr(value, "nbytes", None), int):
+        # Buffers (memoryview, numpy arrays, tensors) report their data size;
+        # getsizeof alone misses it for views
+        return max(size, value.nbytes)
+    elif hasattr(value, "__dict__"):
+        attrs = vars(value)
+        size += sys.getsizeof(attrs)
+        children = list(attrs.values())
+    else:
+        return size
+
+    count = len(children)
+    if count > _SIZE_SAMPLE:
+        sample = children[::count // _SIZE_SAMPLE][:_SIZE_SAMPLE]
+    else:
+        sample = children
+    if not sample:
+        return size
+
+    sampled = sum(_approximate_size(child, depth - 1, seen) for child in sample)
+    return size + sampled * count // len(sample)
+
+
+@dataclass(slots=True)
 class CacheEntry:
-    """Cache entry with metadata."""
+    """Cache entry with metadata (times are time.monotonic() seconds)."""
     key: str
     value: Any
-    created_at: datetime
-    expires_at: Optional[datetime]
+    created_at: float
+    expires_at: Optional[float]
     access_count: int = 0
-    last_accessed: Optional[datetime] = None
+    last_accessed: Optional[float] = None
     size_bytes: int = 0
 
     def is_expired(self) -> bool:
         """Check if entry is expired."""
-        if self.expires_at is None:
-            return False
-        return datetime.utcnow() > self.expires_at
+        return self.expires_at is not None and time.monotonic() > self.expires_at
 
     def touch(self):
         """Update access metadata."""
         self.access_count += 1
-        self.last_accessed = datetime.utcnow()
+        self.last_accessed = time.monotonic()
 
 
 class LRUCache:
     """
     LRU (Least Recently Used) Cache with TTL support.
 
-    Thread-safe, async-compatible cache with automatic eviction.
+    Thread-safe cache with automatic eviction. The work is pure in-memory
+    under a short-held threading lock, so get_nowait/set_nowait/
+    delete_nowait/clear_nowait do it synchronously; the async
+    get/set/delete/clear delegate to them.
     """
 
     def __init__(
         self,
         max_size: int = 1000,
         default_ttl: Optional[float] = None,  # seconds
-        max_memory_bytes: Optional[int] = None
+        max_memory_bytes: Optional[int] = None,
+        accurate_size: bool = False,
+        lock: Optional[threading.Lock] = None
     ):
         self.max_size = max_size
         self.default_ttl = default_ttl
         self.max_memory_bytes = max_memory_bytes
+        # Measure entries by pickling them instead of approximating
+        self.accurate_size = accurate_size
 
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        self._lock = asyncio.Lock()
+        # A lock passed in is shared with other caches (see MultiLevelCache)
+        self._lock = lock or threading.Lock()
         self._current_memory = 0
 
-        # Statistics
+        # Statistics (updated under the lock)
         self.hits = 0
         self.misses = 0
         self.evictions = 0
@@ -85,26 +160,64 @@ class LRUCache:
         Raises:
             CacheMissError: If key not found or expired
         """
-        async with self._lock:
-            if key not in self._cache:
-                self.misses += 1
-                logger.debug(f"Cache miss: {key}", hits=self.hits, misses=self.misses)
-                raise CacheMissError(key)
+        return self.get_nowait(key)
 
-            entry = self._cache[key]
+    def get_nowait(self, key: str) -> Any:
+        """get() for synchronous callers (raises CacheMissError the same way)."""
+        try:
+            with self._lock:
+                value = self._count_lookup(key)
+        except CacheMissError:
+            self._log_miss(key)
+            raise
 
-            # Check expiration
-            if entry.is_expired():
+        self._log_hit(key)
+        return value
+
+    def _get_unlocked(self, key: str) -> Any:
+        """get_nowait() for callers already holding the lock."""
+        try:
+            value = self._count_lookup(key)
+        except CacheMissError:
+            self._log_miss(key)
+            raise
+
+        self._log_hit(key)
+        return value
+
+    def _count_lookup(self, key: str) -> Any:
+        """_lookup() that also counts the hit or miss (lock held)."""
+        try:
+            value = self._lookup(key)
+        except CacheMissError:
+            self.misses += 1
+            raise
+
+        self.hits += 1
+        return value
+
+    def _lookup(self, key: str) -> Any:
+        """Find a live entry and mark it used (lock held, statistics not counted)."""
+        if key not in self._cache:
+            raise CacheMissError(key)
+
+        entry = self._cache[key]
+
+        # Check expiration
+        if entry.is_expired():
+            if logger.is_enabled_for(DEBUG):
                 logger.debug(f"Cache entry expired: {key}")
-                await self._remove_entry(key)
-                self.misses += 1
-                raise CacheMissError(key)
+            self._remove_entry(key)
+            raise CacheMissError(key)
 
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            entry.touch()
-            self.hits += 1
+        # Move to end (most recently used)
+        self._cache.move_to_end(key)
+        entry.touch()
+        return entry.value
 
+    def _log_hit(self, key: str):
+        """Log a hit."""
+        if logger.is_enabled_for(DEBUG):
             logger.debug(
                 f"Cache hit: {key}",
                 hits=self.hits,
@@ -112,13 +225,17 @@ class LRUCache:
                 hit_rate=self.get_hit_rate()
             )
 
-            return entry.value
+    def _log_miss(self, key: str):
+        """Log a miss."""
+        if logger.is_enabled_for(DEBUG):
+            logger.debug(f"Cache miss: {key}", hits=self.hits, misses=self.misses)
 
     async def set(
         self,
         key: str,
         value: Any,
-        ttl: Optional[float] = None
+        ttl: Optional[float] = None,
+        size_bytes: Optional[int] = None
     ):
         """
         Set value in cache.
@@ -127,46 +244,60 @@ class LRUCache:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds (None = use default)
+            size_bytes: Known size of value in bytes (None = estimate it when
+                max_memory_bytes is set, otherwise count it as 0)
         """
-        async with self._lock:
-            # Calculate size
-            size_bytes = self._estimate_size(value)
-
-            # Calculate expiration
-            ttl_seconds = ttl if ttl is not None else self.default_ttl
-            expires_at = None
-            if ttl_seconds is not None:
-                expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-
-            # Create entry
-            entry = CacheEntry(
-                key=key,
-                value=value,
-                created_at=datetime.utcnow(),
-                expires_at=expires_at,
-                size_bytes=size_bytes
-            )
+        self.set_nowait(key, value, ttl, size_bytes)
+
+    def set_nowait(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        size_bytes: Optional[int] = None
+    ):
+        """set() for synchronous callers."""
+        with self._lock:
+            self._set_unlocked(key, value, ttl, size_bytes)
 
-            # Remove old entry if exists
-            if key in self._cache:
-                await self._remove_entry(key)
+    def _set_unlocked(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        size_bytes: Optional[int] = None
+    ):
+        """set_nowait() for callers already holding the lock."""
+        # Calculate size (only needed to enforce a memory limit)
+        if size_bytes is None:
+            size_bytes = self._estimate_size(value) if self.max_memory_bytes is not None else 0
+
+        # Calculate expiration
+        now = time.monotonic()
+        ttl_seconds = ttl if ttl is not None else self.default_ttl
+        expires_at = now + ttl_seconds if ttl_seconds is not None else None
+
+        # Create entry
+        entry = CacheEntry(
+            key=key,
+            value=value,
+            created_at=now,
+            expires_at=expires_at,
+            size_bytes=size_bytes
+        )
 
-            # Check memory limit
-            if self.max_memory_bytes:
-                while (
-                    self._current_memory + size_bytes > self.max_memory_bytes
-                    and self._cache
-                ):
-                    await self._evict_lru()
+        # Remove old entry if exists
+        if key in self._cache:
+            self._remove_entry(key)
 
-            # Check size limit
-            while len(self._cache) >= self.max_size and self._cache:
-                await self._evict_lru()
+        # Make room under the size and memory limits
+        self._evict_until(size_bytes)
 
-            # Add entry
-            self._cache[key] = entry
-            self._current_memory += size_bytes
+        # Add entry
+        self._cache[key] = entry
+        self._current_memory += size_bytes
 
+        if logger.is_enabled_for(DEBUG):
             logger.debug(
                 f"Cache set: {key}",
                 size_bytes=size_bytes,
@@ -176,40 +307,69 @@ class LRUCache:
 
     async def delete(self, key: str):
         """Delete entry from cache."""
-        async with self._lock:
-            await self._remove_entry(key)
+        self.delete_nowait(key)
+
+    def delete_nowait(self, key: str):
+        """delete() for synchronous callers."""
+        with self._lock:
+            self._remove_entry(key)
 
     async def clear(self):
         """Clear entire cache."""
-        async with self._lock:
-            self._cache.clear()
-            self._current_memory = 0
-            logger.info("Cache cleared")
+        self.clear_nowait()
+
+    def clear_nowait(self):
+        """clear() for synchronous callers."""
+        with self._lock:
+            self._clear_unlocked()
 
-    async def _remove_entry(self, key: str):
+    def _clear_unlocked(self):
+        """clear_nowait() for callers already holding the lock."""
+        self._cache.clear()
+        self._current_memory = 0
+        logger.info("Cache cleared")
+
+    def _remove_entry(self, key: str):
         """Remove entry and update memory."""
         if key in self._cache:
             entry = self._cache.pop(key)
             self._current_memory -= entry.size_bytes
 
-    async def _evict_lru(self):
-        """Evict least recently used entry."""
-        if not self._cache:
+    def _evict_until(self, size_bytes: int):
+        """Evict least recently used entries until one of size_bytes fits."""
+        cache = self._cache
+        max_size = self.max_size
+        max_memory = self.max_memory_bytes
+        memory = self._current_memory
+        evicted = 0
+
+        # Remove from the front (least recently used) in one batch
+        while cache and (
+            len(cache) >= max_size
+            or (max_memory and memory + size_bytes > max_memory)
+        ):
+            _, entry = cache.popitem(last=False)
+            memory -= entry.size_bytes
+            evicted += 1
+
+        if not evicted:
             return
 
-        # Remove first item (least recently used)
-        key, entry = self._cache.popitem(last=False)
-        self._current_memory -= entry.size_bytes
-        self.evictions += 1
+        self._current_memory = memory
+        self.evictions += evicted
 
-        logger.debug(
-            f"Cache eviction: {key}",
-            reason="LRU",
-            total_evictions=self.evictions
-        )
+        if logger.is_enabled_for(DEBUG):
+            logger.debug(
+                f"Cache eviction: evicted {evicted} entries",
+                reason="LRU",
+                total_evictions=self.evictions
+            )
 
     def _estimate_size(self, value: Any) -> int:
         """Estimate size of value in bytes."""
+        if not self.accurate_size:
+            return _approximate_size(value)
+
         try:
             return len(pickle.dumps(value))
         except Exception:
@@ -236,10 +396,18 @@ class LRUCache:
             "hit_rate": self.get_hit_rate()
         }
 
+    def reset_stats(self):
+        """Reset hit, miss and eviction counts."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
     def get_hit_rate(self) -> float:
         """Calculate cache hit rate."""
-        total = self.hits + self.misses
-        return self.hits / total if total > 0 else 0.0
+        hits = self.hits
+        total = hits + self.misses
+        return hits / total if total > 0 else 0.0
 
 
 class MultiLevelCache:
@@ -256,8 +424,14 @@ class MultiLevelCache:
         l2_size: int = 1000,
         l2_ttl: Optional[float] = 3600,  # 1 hour
     ):
-        self.l1_cache = LRUCache(max_size=l1_size, default_ttl=l1_ttl)
-        self.l2_cache = LRUCache(max_size=l2_size, default_ttl=l2_ttl)
+        # One lock for both levels, so a lookup through L1, L2 and promotion
+        # is a single critical section
+        self._lock = threading.Lock()
+        self.l1_cache = LRUCache(max_size=l1_size, default_ttl=l1_ttl, lock=self._lock)
+        self.l2_cache = LRUCache(max_size=l2_size, default_ttl=l2_ttl, lock=self._lock)
+        # Write-behind buffer of L2 writes, drained in one batch per loop iteration
+        self._pending_l2: Dict[str, tuple] = {}
+        self._drain_scheduled = False
 
     async def get(self, key: str) -> Any:
         """
@@ -265,42 +439,81 @@ class MultiLevelCache:
 
         Promotes L2 hits to L1 for better performance.
         """
-        try:
-            # Try L1 first
-            return await self.l1_cache.get(key)
-        except CacheMissError:
-            pass
+        with self._lock:
+            try:
+                # Try L1 first
+                return self.l1_cache._get_unlocked(key)
+            except CacheMissError:
+                pass
 
-        try:
-            # Try L2
-            value = await self.l2_cache.get(key)
+            pending = self._pending_l2.get(key)
+            if pending is not None:
+                # Written but not yet drained to L2, so counted as an L2 hit
+                value = pending[0]
+                self.l2_cache.hits += 1
+            else:
+                # Try L2 (a miss here propagates)
+                value = self.l2_cache._get_unlocked(key)
 
             # Promote to L1
-            await self.l1_cache.set(key, value)
+            self.l1_cache._set_unlocked(key, value)
+
+        if logger.is_enabled_for(DEBUG):
             logger.debug(f"Cache promotion: {key} from L2 to L1")
 
-            return value
-        except CacheMissError:
-            raise
+        return value
 
-    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        size_bytes: Optional[int] = None
+    ):
         """
         Set value in cache.
 
-        Writes to both L1 and L2 for consistency.
+        Writes L1 immediately; the L2 write is queued and applied off the
+        request path (see flush()).
         """
-        await self.l1_cache.set(key, value, ttl)
-        await self.l2_cache.set(key, value, ttl)
+        if size_bytes is None and (
+            self.l1_cache.max_memory_bytes is not None
+            or self.l2_cache.max_memory_bytes is not None
+        ):
+            # Estimated once and shared by both levels
+            size_bytes = self.l1_cache._estimate_size(value)
+        with self._lock:
+            self.l1_cache._set_unlocked(key, value, ttl, size_bytes)
+            self._pending_l2[key] = (value, ttl, size_bytes)
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            asyncio.get_running_loop().call_soon(self._drain_l2)
+
+    def _drain_l2(self):
+        """Apply queued writes to L2."""
+        with self._lock:
+            self._drain_scheduled = False
+            pending, self._pending_l2 = self._pending_l2, {}
+            for key, (value, ttl, size_bytes) in pending.items():
+                self.l2_cache._set_unlocked(key, value, ttl, size_bytes)
+
+    def flush(self):
+        """Apply any queued L2 writes now (call before shutdown)."""
+        self._drain_l2()
 
     async def delete(self, key: str):
         """Delete from both cache levels."""
-        await self.l1_cache.delete(key)
-        await self.l2_cache.delete(key)
+        with self._lock:
+            self._pending_l2.pop(key, None)
+            self.l1_cache._remove_entry(key)
+            self.l2_cache._remove_entry(key)
 
     async def clear(self):
         """Clear both cache levels."""
-        await self.l1_cache.clear()
-        await self.l2_cache.clear()
+        with self._lock:
+            self._pending_l2.clear()
+            self.l1_cache._clear_unlocked()
+            self.l2_cache._clear_unlocked()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics for both cache levels."""
@@ -318,6 +531,43 @@ class MultiLevelCache:
         return total_hits / total if total > 0 else 0.0
 
 
+_KEY_SCALARS = (str, int, float, bool, type(None))
+
+# Entries kept by cached() when it memoizes directly (same as LRUCache's default)
+_MEMOIZE_SIZE = 1000
+
+
+def _is_scalar_key(value: Any) -> bool:
+    """Check whether a value has a stable repr (scalars and tuples of them)."""
+    if isinstance(value, _KEY_SCALARS):
+        return True
+    return type(value) is tuple and all(map(_is_scalar_key, value))
+
+
+if XXHASH_AVAILABLE:
+    _key_hasher = xxhash.xxh3_128
+else:
+    def _key_hasher(data: bytes = b""):
+        """Start a 128-bit key hash (hexdigest() gives 32 characters)."""
+        return hashlib.blake2b(data, digest_size=16)
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def _dump_key_part(value: Any) -> bytes:
+        """Serialize a non-scalar argument to stable bytes."""
+        try:
+            return orjson.dumps(value, default=str, option=_ORJSON_KEY_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits
+            return repr(value).encode()
+else:
+    def _dump_key_part(value: Any) -> bytes:
+        """Serialize a non-scalar argument to stable bytes."""
+        return json.dumps(value, sort_keys=True, default=str).encode()
+
+
 def cache_key(*args, **kwargs) -> str:
     """
     Generate cache key from function arguments.
@@ -329,23 +579,123 @@ def cache_key(*args, **kwargs) -> str:
     Returns:
         Hash of arguments as cache key
     """
-    # Create stable representation
-    key_parts = []
+    # Fast path: scalar-only calls are keyed by their repr
+    if all(map(_is_scalar_key, args)) and all(map(_is_scalar_key, kwargs.values())):
+        key_string = f"r{args!r}{sorted(kwargs.items())!r}"
+        return _key_hasher(key_string.encode()).hexdigest()
+
+    # Hash a stable representation part by part
+    hasher = _key_hasher(b"j")
 
     for arg in args:
         if isinstance(arg, (str, int, float, bool)):
-            key_parts.append(str(arg))
+            hasher.update(str(arg).encode())
         else:
-            key_parts.append(json.dumps(arg, sort_keys=True, default=str))
+            hasher.update(_dump_key_part(arg))
+        hasher.update(b"|")
 
     for k, v in sorted(kwargs.items()):
+        hasher.update(f"{k}=".encode())
         if isinstance(v, (str, int, float, bool)):
-            key_parts.append(f"{k}={v}")
+            hasher.update(str(v).encode())
         else:
-            key_parts.append(f"{k}={json.dumps(v, sort_keys=True, default=str)}")
+            hasher.update(_dump_key_part(v))
+        hasher.update(b"|")
+
+    return hasher.hexdigest()
+
+
+def _result_size(result: Any) -> Optional[int]:
+    """Size of a scalar result via sys.getsizeof (None = let the cache estimate)."""
+    return sys.getsizeof(result) if isinstance(result, _ATOMIC_TYPES) else None
+
 
-    key_string = "|".join(key_parts)
-    return hashlib.sha256(key_string.encode()).hexdigest()
+def _memoize_sync(func: Callable[..., T], maxsize: int) -> Callable[..., T]:
+    """Memoize a sync function with functools.lru_cache, bypassing it for unhashable args."""
+    # typed=True keeps 1, 1.0 and True apart, as cache_key() does
+    memo = lru_cache(maxsize=maxsize, typed=True)(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> T:
+        try:
+            return memo(*args, **kwargs)
+        except TypeError:
+            try:
+                hash((args, tuple(kwargs.values())))
+            except TypeError:
+                return func(*args, **kwargs)
+            raise
+
+    wrapper.cache_info = memo.cache_info
+    wrapper.cache_clear = memo.cache_clear
+    return wrapper
+
+
+async def _single_flight(
+    in_flight: Dict[str, asyncio.Task],
+    key: str,
+    compute: Callable[[], Any],
+    store: Callable[[Any], None]
+) -> Any:
+    """
+    Await compute() once per key across concurrent callers.
+
+    The call runs in its own task, which hands the result to store(); every
+    caller awaits that task for the same result or exception. Callers are
+    shielded from each other, so cancelling one (even the first) leaves the
+    call running for the rest.
+    """
+    task = in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_compute_and_store(compute, store))
+        in_flight[key] = task
+        task.add_done_callback(lambda done: _finish_flight(in_flight, key, done))
+    return await asyncio.shield(task)
+
+
+async def _compute_and_store(compute: Callable[[], Any], store: Callable[[Any], None]) -> Any:
+    """Await compute() and store its result."""
+    result = await compute()
+    store(result)
+    return result
+
+
+def _finish_flight(in_flight: Dict[str, asyncio.Task], key: str, task: asyncio.Task):
+    """Forget a finished call so the next miss starts a new one."""
+    if in_flight.get(key) is task:
+        del in_flight[key]
+    if not task.cancelled():
+        task.exception()  # Mark retrieved; callers re-raise it themselves
+
+
+def _memoize_async(func: Callable[..., T], maxsize: int) -> Callable[..., T]:
+    """Memoize an async function in a plain dict kept in LRU order."""
+    results: Dict[str, Any] = {}
+    in_flight: Dict[str, asyncio.Task] = {}
+
+    def store(key: str, result: Any):
+        if len(results) >= maxsize:
+            del results[next(iter(results))]
+        results[key] = result
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> T:
+        key = cache_key(*args, **kwargs)
+        try:
+            # Re-insert on hit so dict order stays least- to most-recently used
+            result = results.pop(key)
+        except KeyError:
+            return await _single_flight(
+                in_flight,
+                key,
+                lambda: func(*args, **kwargs),
+                lambda result: store(key, result)
+            )
+        results[key] = result
+        return result
+
+    wrapper.cache_clear = results.clear
+    return wrapper
 
 
 def cached(
@@ -361,71 +711,84 @@ def cached(
         ttl: Time to live for cached result
         key_prefix: Prefix for cache keys
 
+    Without a cache instance or TTL, results never expire, so functions are
+    memoized directly (functools.lru_cache for sync functions) instead of
+    going through LRUCache; those wrappers expose cache_clear() rather than .cache.
+
     Example:
         @cached(ttl=300)
         async def expensive_function(arg1, arg2):
             # Your expensive operation
             return result
     """
+    if cache is None and ttl is None:
+        def memoize(func: Callable[..., T]) -> Callable[..., T]:
+            if asyncio.iscoroutinefunction(func):
+                return _memoize_async(func, _MEMOIZE_SIZE)
+            return _memoize_sync(func, _MEMOIZE_SIZE)
+
+        return memoize
+
     cache_instance = cache or LRUCache()
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        # Resolved once per decorated function rather than on every call
+        func_name = func.__name__
+        prefix = sys.intern(f"{key_prefix or func_name}:")
+        in_flight: Dict[str, asyncio.Task] = {}
+
         @wraps(func)
         async def async_wrapper(*args, **kwargs) -> T:
             # Generate cache key
-            func_name = func.__name__
-            prefix = key_prefix or func_name
-            key = f"{prefix}:{cache_key(*args, **kwargs)}"
+            key = prefix + cache_key(*args, **kwargs)
 
             # Try to get from cache
             try:
-                result = await cache_instance.get(key)
-                logger.debug(f"Cache hit for {func_name}", key=key)
+                result = cache_instance.get_nowait(key)
+                if logger.is_enabled_for(DEBUG):
+                    logger.debug(f"Cache hit for {func_name}", key=key)
                 return result
             except CacheMissError:
                 pass
 
             # Execute function
-            logger.debug(f"Cache miss for {func_name}, executing", key=key)
-            result = await func(*args, **kwargs)
-
-            # Cache result
-            await cache_instance.set(key, result, ttl)
-
-            return result
+            if logger.is_enabled_for(DEBUG):
+                logger.debug(f"Cache miss for {func_name}, executing", key=key)
+
+            # Concurrent misses on the same key share one call, cached once
+            return await _single_flight(
+                in_flight,
+                key,
+                lambda: func(*args, **kwargs),
+                lambda result: cache_instance.set_nowait(key, result, ttl, _result_size(result))
+            )
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs) -> T:
-            # For sync functions, use asyncio.run
-            import inspect
-            if inspect.iscoroutinefunction(func):
-                raise ValueError("Use async wrapper for async functions")
-
             # Generate cache key
-            func_name = func.__name__
-            prefix = key_prefix or func_name
-            key = f"{prefix}:{cache_key(*args, **kwargs)}"
+            key = prefix + cache_key(*args, **kwargs)
 
-            # Try to get from cache (sync)
+            # Try to get from cache
             try:
-                result = asyncio.run(cache_instance.get(key))
-                logger.debug(f"Cache hit for {func_name}", key=key)
+                result = cache_instance.get_nowait(key)
+                if logger.is_enabled_for(DEBUG):
+                    logger.debug(f"Cache hit for {func_name}", key=key)
                 return result
             except CacheMissError:
                 pass
 
             # Execute function
-            logger.debug(f"Cache miss for {func_name}, executing", key=key)
+            if logger.is_enabled_for(DEBUG):
+                logger.debug(f"Cache miss for {func_name}, executing", key=key)
             result = func(*args, **kwargs)
 
-            # Cache result (sync)
-            asyncio.run(cache_instance.set(key, result, ttl))
+            # Cache result
+            cache_instance.set_nowait(key, result, ttl, _result_size(result))
 
             return result
 
         # Return appropriate wrapper
-        import inspect
-        if inspect.iscoroutinefunction(func):
+        if asyncio.iscoroutinefunction(func):
             async_wrapper.cache = cache_instance  # Attach for monitoring
             return async_wrapper
         else:
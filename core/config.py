@@ -4,12 +4,19 @@ Production-Grade Configuration Management
 Type-safe configuration with validation, secrets management, and hot-reload support.
 """
 
+import json
 import os
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator, SecretStr
+from pydantic import BaseModel, Field, PrivateAttr, validator, SecretStr
 from pydantic_settings import BaseSettings
 from enum import Enum
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class Environment(str, Enum):
     """Application environment."""
@@ -28,6 +35,16 @@ class ProviderType(str, Enum):
     ANTHROPIC = "anthropic"
 
 
+# Provider sections whose api_key is redacted by KimiConfig.to_dict()
+_PROVIDER_KEYS = ("moonshot", "ollama", "together")
+
+# Configured providers: KimiConfig field, API key env var, base URL env var
+_PROVIDER_FIELDS = {
+    provider: (provider.value, f"{provider.value.upper()}_API_KEY", f"{provider.value.upper()}_API_BASE")
+    for provider in (ProviderType.MOONSHOT, ProviderType.OLLAMA, ProviderType.TOGETHER)
+}
+
+
 class LogFormat(str, Enum):
     """Log output format."""
     JSON = "json"
@@ -170,6 +187,10 @@ class KimiConfig(BaseSettings):
     connection_pool_size: int = Field(default=100, ge=1, le=1000)
     connection_pool_max_keepalive: float = Field(default=30.0, ge=1.0)
 
+    # Redacted to_dict() output and its JSON, rebuilt after clear_dict_cache()
+    _redacted_dict: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _redacted_json: Optional[bytes] = PrivateAttr(default=None)
+
     class Config:
         env_prefix = "KIMI_"
         env_nested_delimiter = "__"
@@ -204,30 +225,26 @@ class KimiConfig(BaseSettings):
         Raises:
             ValueError: If provider not configured
         """
-        config_map = {
-            ProviderType.MOONSHOT: self.moonshot,
-            ProviderType.OLLAMA: self.ollama,
-            ProviderType.TOGETHER: self.together,
-        }
-
-        if provider not in config_map:
-            raise ValueError(f"Provider {provider} not configured")
+        try:
+            field_name, api_key_env, api_base_env = _PROVIDER_FIELDS[provider]
+        except KeyError:
+            raise ValueError(f"Provider {provider} not configured") from None
 
-        config = config_map[provider]
+        config = getattr(self, field_name)
 
         # Load API key from environment if not set
         if config.api_key is None and provider != ProviderType.OLLAMA:
-            env_key = f"{provider.value.upper()}_API_KEY"
-            api_key = os.getenv(env_key)
+            api_key = os.getenv(api_key_env)
             if api_key:
                 config.api_key = SecretStr(api_key)
+                self.clear_dict_cache()
 
         # Load base URL from environment if not set
         if config.base_url is None:
-            env_key = f"{provider.value.upper()}_API_BASE"
-            base_url = os.getenv(env_key)
+            base_url = os.getenv(api_base_env)
             if base_url:
                 config.base_url = base_url
+                self.clear_dict_cache()
 
         return config
 
@@ -235,22 +252,45 @@ class KimiConfig(BaseSettings):
         """
         Convert configuration to dictionary.
 
+        The redacted form is built once and cached until clear_dict_cache();
+        each call returns a shallow copy, so nested sections are shared and
+        must not be modified.
+
         Args:
             include_secrets: Whether to include secret values
 
         Returns:
             Configuration as dictionary
         """
-        data = self.dict()
+        if include_secrets:
+            return self.dict()
+
+        if self._redacted_dict is None:
+            data = self.dict()
 
-        if not include_secrets:
             # Redact secrets
-            for provider_key in ["moonshot", "ollama", "together"]:
-                if provider_key in data and "api_key" in data[provider_key]:
-                    if data[provider_key]["api_key"]:
-                        data[provider_key]["api_key"] = "***REDACTED***"
+            for provider_key in _PROVIDER_KEYS:
+                if provider_key in data and data[provider_key].get("api_key"):
+                    data[provider_key]["api_key"] = "***REDACTED***"
+
+            self._redacted_dict = data
 
-        return data
+        return dict(self._redacted_dict)
+
+    def to_json(self) -> bytes:
+        """Serialize the redacted configuration to JSON bytes (cached like to_dict())."""
+        if self._redacted_json is None:
+            data = self.to_dict()
+            if ORJSON_AVAILABLE:
+                self._redacted_json = orjson.dumps(data, default=str)
+            else:
+                self._redacted_json = json.dumps(data, default=str).encode()
+        return self._redacted_json
+
+    def clear_dict_cache(self):
+        """Drop the cached to_dict()/to_json() output (call after mutating fields directly)."""
+        self._redacted_dict = None
+        self._redacted_json = None
 
     def validate_config(self) -> List[str]:
         """
@@ -297,6 +337,8 @@ class ConfigManager:
 
     def __init__(self, config: Optional[KimiConfig] = None):
         self._config = config or KimiConfig()
+        # Resolved provider configs, cleared whenever the config changes
+        self._provider_cache: Dict[ProviderType, ProviderConfig] = {}
         self._validate()
 
     def _validate(self):
@@ -314,6 +356,7 @@ class ConfigManager:
     def reload(self):
         """Reload configuration from environment."""
         self._config = KimiConfig()
+        self._provider_cache.clear()
         self._validate()
 
     def update(self, **kwargs):
@@ -327,8 +370,14 @@ class ConfigManager:
             if hasattr(self._config, key):
                 setattr(self._config, key, value)
 
+        self._provider_cache.clear()
+        self._config.clear_dict_cache()
         self._validate()
 
+    def serialized(self) -> bytes:
+        """Get the current configuration as redacted JSON bytes."""
+        return self._config.to_json()
+
     def get_provider_config(self, provider: Optional[ProviderType] = None) -> ProviderConfig:
         """
         Get provider configuration.
@@ -340,7 +389,12 @@ class ConfigManager:
             Provider configuration
         """
         provider_type = provider or self._config.default_provider
-        return self._config.get_provider_config(provider_type)
+        try:
+            return self._provider_cache[provider_type]
+        except KeyError:
+            config = self._config.get_provider_config(provider_type)
+            self._provider_cache[provider_type] = config
+            return config
 
 
 # Global configuration instance
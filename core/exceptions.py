@@ -4,11 +4,19 @@ Production-Grade Exception Hierarchy for Kimi K2.5
 Comprehensive exception handling with detailed context and error recovery guidance.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from enum import Enum
+from functools import lru_cache
+import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class ErrorCategory(Enum):
+
+class ErrorCategory(str, Enum):
     """Error categories for monitoring and alerting."""
     NETWORK = "network"
     AUTHENTICATION = "authentication"
@@ -21,7 +29,7 @@ class ErrorCategory(Enum):
     INTERNAL = "internal"
 
 
-class ErrorSeverity(Enum):
+class ErrorSeverity(str, Enum):
     """Error severity levels."""
     LOW = "low"
     MEDIUM = "medium"
@@ -40,56 +48,98 @@ class KimiError(Exception):
         context: Additional context about the error
         recovery_hint: Suggestion for error recovery
         original_error: Original exception if wrapped
+
+    Subclasses set DEFAULT_CATEGORY, DEFAULT_SEVERITY and
+    DEFAULT_RECOVERY_HINT, used for any of those arguments left as None.
     """
 
+    DEFAULT_CATEGORY = ErrorCategory.INTERNAL
+    DEFAULT_SEVERITY = ErrorSeverity.MEDIUM
+    DEFAULT_RECOVERY_HINT: Optional[str] = None
+
+    # Class name reported as error_type, set once per subclass
+    _ERROR_TYPE_NAME = "KimiError"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._ERROR_TYPE_NAME = cls.__name__
+
     def __init__(
         self,
         message: str,
-        category: ErrorCategory = ErrorCategory.INTERNAL,
-        severity: ErrorSeverity = ErrorSeverity.MEDIUM,
+        category: Optional[ErrorCategory] = None,
+        severity: Optional[ErrorSeverity] = None,
         context: Optional[Dict[str, Any]] = None,
         recovery_hint: Optional[str] = None,
         original_error: Optional[Exception] = None
     ):
         super().__init__(message)
         self.message = message
-        self.category = category
-        self.severity = severity
+        self.category = category or self.DEFAULT_CATEGORY
+        self.severity = severity or self.DEFAULT_SEVERITY
+        # Plain strings for to_dict(), read once here
+        self._category_str = self.category.value
+        self._severity_str = self.severity.value
         self.context = context or {}
-        self.recovery_hint = recovery_hint
+        self.recovery_hint = recovery_hint or self.DEFAULT_RECOVERY_HINT
         self.original_error = original_error
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary for logging/serialization."""
         return {
-            "error_type": self.__class__.__name__,
+            "error_type": self._ERROR_TYPE_NAME,
             "message": self.message,
-            "category": self.category.value,
-            "severity": self.severity.value,
+            "category": self._category_str,
+            "severity": self._severity_str,
             "context": self.context,
             "recovery_hint": self.recovery_hint,
             "original_error": str(self.original_error) if self.original_error else None
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to_dict() as JSON bytes (context values that aren't JSON become str)."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict(), default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self.to_dict(), default=str).encode()
+
+
+class _ProviderScopedError(KimiError):
+    """
+    Base for errors tied to a provider.
+
+    The provider is available both as an attribute and as context["provider"].
+    """
+
+    def __init__(
+        self,
+        message: str,
+        provider: str,
+        context: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ):
+        self.provider = provider
+        # Built here rather than written into the caller's dict
+        context = {**context, "provider": provider} if context else {"provider": provider}
+        super().__init__(message, context=context, **kwargs)
+
 
 # Network-related errors
 class NetworkError(KimiError):
     """Base class for network-related errors."""
 
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault("category", ErrorCategory.NETWORK)
-        kwargs.setdefault("severity", ErrorSeverity.HIGH)
-        super().__init__(message, **kwargs)
+    DEFAULT_CATEGORY = ErrorCategory.NETWORK
+    DEFAULT_SEVERITY = ErrorSeverity.HIGH
 
 
-class ConnectionError(NetworkError):
+class ConnectionError(_ProviderScopedError, NetworkError):
     """Failed to establish connection to provider."""
 
+    DEFAULT_RECOVERY_HINT = "Check network connectivity and provider availability. Consider using fallback provider."
+
     def __init__(self, provider: str, original_error: Optional[Exception] = None):
         super().__init__(
             f"Failed to connect to provider: {provider}",
-            recovery_hint="Check network connectivity and provider availability. Consider using fallback provider.",
-            context={"provider": provider},
+            provider,
             original_error=original_error
         )
 
@@ -97,6 +147,9 @@ class ConnectionError(NetworkError):
 class TimeoutError(NetworkError):
     """Request timed out."""
 
+    DEFAULT_CATEGORY = ErrorCategory.TIMEOUT
+    DEFAULT_RECOVERY_HINT = "Increase timeout value or optimize request complexity. Consider breaking into smaller requests."
+
     def __init__(
         self,
         timeout_seconds: float,
@@ -105,53 +158,51 @@ class TimeoutError(NetworkError):
     ):
         super().__init__(
             f"Operation '{operation}' timed out after {timeout_seconds}s",
-            category=ErrorCategory.TIMEOUT,
-            recovery_hint="Increase timeout value or optimize request complexity. Consider breaking into smaller requests.",
             context={"timeout_seconds": timeout_seconds, "operation": operation},
             original_error=original_error
         )
 
 
 # Authentication errors
-class AuthenticationError(KimiError):
+class AuthenticationError(_ProviderScopedError):
     """Authentication-related errors."""
 
-    def __init__(self, message: str, provider: str, **kwargs):
-        kwargs.setdefault("category", ErrorCategory.AUTHENTICATION)
-        kwargs.setdefault("severity", ErrorSeverity.CRITICAL)
-        kwargs.setdefault("recovery_hint", "Verify API key and provider credentials")
-        kwargs["context"] = kwargs.get("context", {})
-        kwargs["context"]["provider"] = provider
-        super().__init__(message, **kwargs)
+    DEFAULT_CATEGORY = ErrorCategory.AUTHENTICATION
+    DEFAULT_SEVERITY = ErrorSeverity.CRITICAL
+    DEFAULT_RECOVERY_HINT = "Verify API key and provider credentials"
 
 
 class InvalidAPIKeyError(AuthenticationError):
     """API key is invalid or expired."""
 
+    DEFAULT_RECOVERY_HINT = "Check API key validity and regenerate if necessary"
+
     def __init__(self, provider: str):
         super().__init__(
             f"Invalid or expired API key for provider: {provider}",
-            provider=provider,
-            recovery_hint="Check API key validity and regenerate if necessary"
+            provider=provider
         )
 
 
 class InsufficientPermissionsError(AuthenticationError):
     """API key lacks required permissions."""
 
+    DEFAULT_RECOVERY_HINT = "Update API key permissions or use a key with appropriate access"
+
     def __init__(self, provider: str, required_permission: str):
         super().__init__(
             f"API key lacks permission '{required_permission}' for provider: {provider}",
             provider=provider,
-            context={"required_permission": required_permission},
-            recovery_hint="Update API key permissions or use a key with appropriate access"
+            context={"required_permission": required_permission}
         )
 
 
 # Rate limiting errors
-class RateLimitError(KimiError):
+class RateLimitError(_ProviderScopedError):
     """Rate limit exceeded."""
 
+    DEFAULT_CATEGORY = ErrorCategory.RATE_LIMIT
+
     def __init__(
         self,
         provider: str,
@@ -161,13 +212,8 @@ class RateLimitError(KimiError):
         retry_hint = f"Retry after {retry_after} seconds" if retry_after else "Implement exponential backoff"
         super().__init__(
             f"Rate limit exceeded for provider: {provider}",
-            category=ErrorCategory.RATE_LIMIT,
-            severity=ErrorSeverity.MEDIUM,
-            context={
-                "provider": provider,
-                "retry_after": retry_after,
-                "limit_type": limit_type
-            },
+            provider,
+            context={"retry_after": retry_after, "limit_type": limit_type},
             recovery_hint=retry_hint
         )
 
@@ -176,22 +222,33 @@ class RateLimitError(KimiError):
 class ValidationError(KimiError):
     """Input validation failed."""
 
-    def __init__(self, message: str, field: Optional[str] = None, **kwargs):
-        kwargs.setdefault("category", ErrorCategory.VALIDATION)
-        kwargs.setdefault("severity", ErrorSeverity.LOW)
-        kwargs["context"] = kwargs.get("context", {})
+    DEFAULT_CATEGORY = ErrorCategory.VALIDATION
+    DEFAULT_SEVERITY = ErrorSeverity.LOW
+
+    def __init__(
+        self,
+        message: str,
+        field: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ):
+        if context is None:
+            context = {}
         if field:
-            kwargs["context"]["field"] = field
-        super().__init__(message, **kwargs)
+            context["field"] = field
+        super().__init__(message, context=context, **kwargs)
 
 
 class InvalidModelError(ValidationError):
     """Invalid model specified."""
 
+    DEFAULT_RECOVERY_HINT = "Use a supported model for this provider"
+
     def __init__(self, model: str, provider: str, available_models: Optional[list] = None):
         message = f"Invalid model '{model}' for provider '{provider}'"
         if available_models:
-            message += f". Available models: {', '.join(available_models)}"
+            available_models = tuple(available_models)
+            message += _format_models(available_models)
 
         super().__init__(
             message,
@@ -200,11 +257,16 @@ class InvalidModelError(ValidationError):
                 "model": model,
                 "provider": provider,
                 "available_models": available_models
-            },
-            recovery_hint="Use a supported model for this provider"
+            }
         )
 
 
+@lru_cache(maxsize=256)
+def _format_models(models: Tuple[str, ...]) -> str:
+    """Message suffix listing a provider's models (registries rarely change)."""
+    return f". Available models: {', '.join(models)}"
+
+
 class InvalidParameterError(ValidationError):
     """Invalid parameter value."""
 
@@ -218,38 +280,39 @@ class InvalidParameterError(ValidationError):
 
 
 # Provider errors
-class ProviderError(KimiError):
+class ProviderError(_ProviderScopedError):
     """Provider-specific errors."""
 
+    DEFAULT_CATEGORY = ErrorCategory.PROVIDER
+
     def __init__(self, provider: str, message: str, **kwargs):
-        kwargs.setdefault("category", ErrorCategory.PROVIDER)
-        kwargs["context"] = kwargs.get("context", {})
-        kwargs["context"]["provider"] = provider
-        super().__init__(message, **kwargs)
+        super().__init__(message, provider, **kwargs)
 
 
 class ProviderUnavailableError(ProviderError):
     """Provider is temporarily unavailable."""
 
+    DEFAULT_SEVERITY = ErrorSeverity.HIGH
+    DEFAULT_RECOVERY_HINT = "Wait and retry, or switch to fallback provider"
+
     def __init__(self, provider: str, status_code: Optional[int] = None):
         super().__init__(
             provider,
             f"Provider '{provider}' is temporarily unavailable",
-            severity=ErrorSeverity.HIGH,
-            context={"status_code": status_code} if status_code else {},
-            recovery_hint="Wait and retry, or switch to fallback provider"
+            context={"status_code": status_code} if status_code else None
         )
 
 
 class ProviderResponseError(ProviderError):
     """Provider returned unexpected response."""
 
+    DEFAULT_RECOVERY_HINT = "Check provider status page and validate request parameters"
+
     def __init__(self, provider: str, status_code: int, response_body: Optional[str] = None):
         super().__init__(
             provider,
             f"Provider '{provider}' returned error status {status_code}",
-            context={"status_code": status_code, "response_body": response_body},
-            recovery_hint="Check provider status page and validate request parameters"
+            context={"status_code": status_code, "response_body": response_body}
         )
 
 
@@ -257,10 +320,7 @@ class ProviderResponseError(ProviderError):
 class ResourceError(KimiError):
     """Resource-related errors."""
 
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault("category", ErrorCategory.RESOURCE)
-        kwargs.setdefault("severity", ErrorSeverity.MEDIUM)
-        super().__init__(message, **kwargs)
+    DEFAULT_CATEGORY = ErrorCategory.RESOURCE
 
 
 class ResourceExhaustedError(ResourceError):
@@ -278,9 +338,12 @@ class ResourceExhaustedError(ResourceError):
         )
 
 
-class QuotaExceededError(ResourceError):
+class QuotaExceededError(_ProviderScopedError, ResourceError):
     """API quota exceeded."""
 
+    DEFAULT_SEVERITY = ErrorSeverity.HIGH
+    DEFAULT_RECOVERY_HINT = "Wait for quota reset or upgrade plan"
+
     def __init__(self, quota_type: str, provider: str, reset_time: Optional[str] = None):
         message = f"Quota exceeded for '{quota_type}' on provider '{provider}'"
         if reset_time:
@@ -288,13 +351,8 @@ class QuotaExceededError(ResourceError):
 
         super().__init__(
             message,
-            severity=ErrorSeverity.HIGH,
-            context={
-                "quota_type": quota_type,
-                "provider": provider,
-                "reset_time": reset_time
-            },
-            recovery_hint="Wait for quota reset or upgrade plan"
+            provider,
+            context={"quota_type": quota_type, "reset_time": reset_time}
         )
 
 
@@ -302,10 +360,8 @@ class QuotaExceededError(ResourceError):
 class ConfigurationError(KimiError):
     """Configuration-related errors."""
 
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault("category", ErrorCategory.CONFIGURATION)
-        kwargs.setdefault("severity", ErrorSeverity.CRITICAL)
-        super().__init__(message, **kwargs)
+    DEFAULT_CATEGORY = ErrorCategory.CONFIGURATION
+    DEFAULT_SEVERITY = ErrorSeverity.CRITICAL
 
 
 class MissingConfigurationError(ConfigurationError):
@@ -334,17 +390,18 @@ class InvalidConfigurationError(ConfigurationError):
 class CircuitBreakerError(KimiError):
     """Circuit breaker is open."""
 
+    DEFAULT_CATEGORY = ErrorCategory.PROVIDER
+    DEFAULT_SEVERITY = ErrorSeverity.HIGH
+    DEFAULT_RECOVERY_HINT = "Wait for circuit breaker to reset or switch to fallback provider"
+
     def __init__(self, service: str, failure_count: int, threshold: int):
         super().__init__(
             f"Circuit breaker open for '{service}' after {failure_count} failures (threshold: {threshold})",
-            category=ErrorCategory.PROVIDER,
-            severity=ErrorSeverity.HIGH,
             context={
                 "service": service,
                 "failure_count": failure_count,
                 "threshold": threshold
-            },
-            recovery_hint="Wait for circuit breaker to reset or switch to fallback provider"
+            }
         )
 
 
@@ -352,13 +409,13 @@ class CircuitBreakerError(KimiError):
 class RetryExhaustedError(KimiError):
     """All retry attempts exhausted."""
 
+    DEFAULT_SEVERITY = ErrorSeverity.HIGH
+    DEFAULT_RECOVERY_HINT = "Check underlying error and consider manual intervention"
+
     def __init__(self, operation: str, attempts: int, last_error: Exception):
         super().__init__(
             f"Retry exhausted for '{operation}' after {attempts} attempts",
-            category=ErrorCategory.INTERNAL,
-            severity=ErrorSeverity.HIGH,
             context={"operation": operation, "attempts": attempts},
-            recovery_hint="Check underlying error and consider manual intervention",
             original_error=last_error
         )
 
@@ -367,29 +424,25 @@ class RetryExhaustedError(KimiError):
 class CacheError(KimiError):
     """Cache-related errors."""
 
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault("category", ErrorCategory.INTERNAL)
-        kwargs.setdefault("severity", ErrorSeverity.LOW)
-        super().__init__(message, **kwargs)
+    DEFAULT_SEVERITY = ErrorSeverity.LOW
 
 
 class CacheMissError(CacheError):
     """Cache entry not found."""
 
+    DEFAULT_RECOVERY_HINT = "Fetch from source and populate cache"
+
     def __init__(self, key: str):
-        super().__init__(
-            f"Cache miss for key: {key}",
-            context={"key": key},
-            recovery_hint="Fetch from source and populate cache"
-        )
+        super().__init__(f"Cache miss for key: {key}", context={"key": key})
 
 
 class CacheInvalidationError(CacheError):
     """Failed to invalidate cache."""
 
+    DEFAULT_RECOVERY_HINT = "Manual cache clear may be required"
+
     def __init__(self, key: str, reason: str):
         super().__init__(
             f"Failed to invalidate cache for key '{key}': {reason}",
-            context={"key": key, "reason": reason},
-            recovery_hint="Manual cache clear may be required"
+            context={"key": key, "reason": reason}
         )
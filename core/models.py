@@ -4,10 +4,29 @@ Production-Grade Type-Safe Models
 Pydantic models for all data structures with comprehensive validation.
 """
 
-from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field, validator, root_validator
+from typing import Annotated, Optional, List, Dict, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, computed_field, field_validator, model_validator
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime
 from enum import Enum
+import json
+import re
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Any non-whitespace character (same test as str.isspace, without a stripped copy)
+_NON_SPACE = re.compile(r"\S")
 
 
 class MessageRole(str, Enum):
@@ -20,25 +39,25 @@ class MessageRole(str, Enum):
 
 class Message(BaseModel):
     """Chat message with validation."""
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+
     role: MessageRole
-    content: str = Field(..., min_length=1, max_length=100000)
+    content: Annotated[str, Field(min_length=1, max_length=100000)]
     name: Optional[str] = Field(None, max_length=256)
     function_call: Optional[Dict[str, Any]] = None
 
-    @validator("content")
+    @field_validator("content", mode="after")
+    @classmethod
     def validate_content(cls, v):
-        """Ensure content is not empty after stripping."""
-        if not v.strip():
+        """Ensure content is not only whitespace."""
+        if _NON_SPACE.search(v) is None:
             raise ValueError("Message content cannot be empty")
         return v
 
-    class Config:
-        use_enum_values = True
-
 
 class ChatRequest(BaseModel):
     """Chat completion request."""
-    messages: List[Message] = Field(..., min_items=1)
+    messages: List[Message] = Field(..., min_length=1)
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: int = Field(default=4096, ge=1, le=128000)
     top_p: float = Field(default=1.0, ge=0.0, le=1.0)
@@ -51,19 +70,20 @@ class ChatRequest(BaseModel):
     enable_swarm: bool = False
     max_agents: Optional[int] = Field(None, ge=1, le=1000)
 
-    @validator("messages")
+    @field_validator("messages")
+    @classmethod
     def validate_messages(cls, v):
         """Ensure at least one user or system message."""
         if not any(msg.role in [MessageRole.USER, MessageRole.SYSTEM] for msg in v):
             raise ValueError("At least one user or system message required")
         return v
 
-    @root_validator
-    def validate_swarm_config(cls, values):
+    @model_validator(mode="after")
+    def validate_swarm_config(self):
         """Validate swarm configuration."""
-        if values.get("enable_swarm") and not values.get("max_agents"):
-            values["max_agents"] = 100  # Default
-        return values
+        if self.enable_swarm and not self.max_agents:
+            self.max_agents = 100  # Default
+        return self
 
 
 class TokenUsage(BaseModel):
@@ -72,21 +92,21 @@ class TokenUsage(BaseModel):
     completion_tokens: int = Field(..., ge=0)
     total_tokens: int = Field(..., ge=0)
 
-    @root_validator
-    def validate_total(cls, values):
+    @model_validator(mode="after")
+    def validate_total(self):
         """Ensure total equals sum of parts."""
-        prompt = values.get("prompt_tokens", 0)
-        completion = values.get("completion_tokens", 0)
-        total = values.get("total_tokens", 0)
+        total = self.prompt_tokens + self.completion_tokens
 
-        if total != prompt + completion:
-            values["total_tokens"] = prompt + completion
+        if self.total_tokens != total:
+            self.total_tokens = total
 
-        return values
+        return self
 
 
 class Choice(BaseModel):
     """Single completion choice."""
+    model_config = ConfigDict(frozen=True)
+
     index: int = Field(..., ge=0)
     message: Message
     finish_reason: Optional[str] = None
@@ -135,8 +155,15 @@ class HealthStatus(str, Enum):
     UNHEALTHY = "unhealthy"
 
 
+# Statuses from best to worst, and each status's rank in that order
+_HEALTH_BY_RANK = (HealthStatus.HEALTHY, HealthStatus.DEGRADED, HealthStatus.UNHEALTHY)
+_HEALTH_RANK = {status: rank for rank, status in enumerate(_HEALTH_BY_RANK)}
+
+
 class ComponentHealth(BaseModel):
     """Health status of a component."""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     status: HealthStatus
     message: Optional[str] = None
@@ -150,26 +177,17 @@ class SystemHealth(BaseModel):
     components: List[ComponentHealth]
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
-    @root_validator
-    def determine_overall_status(cls, values):
+    @model_validator(mode="after")
+    def determine_overall_status(self):
         """Determine overall status from components."""
-        components = values.get("components", [])
+        # Overall status is worst component status (unhealthy if there are none)
+        worst = max(
+            (_HEALTH_RANK[c.status] for c in self.components),
+            default=_HEALTH_RANK[HealthStatus.UNHEALTHY]
+        )
+        self.status = _HEALTH_BY_RANK[worst]
 
-        if not components:
-            values["status"] = HealthStatus.UNHEALTHY
-            return values
-
-        # Overall status is worst component status
-        statuses = [c.status for c in components]
-
-        if HealthStatus.UNHEALTHY in statuses:
-            values["status"] = HealthStatus.UNHEALTHY
-        elif HealthStatus.DEGRADED in statuses:
-            values["status"] = HealthStatus.DEGRADED
-        else:
-            values["status"] = HealthStatus.HEALTHY
-
-        return values
+        return self
 
 
 class CacheMetrics(BaseModel):
@@ -180,7 +198,13 @@ class CacheMetrics(BaseModel):
     size: int = Field(default=0, ge=0)
     max_size: int = Field(default=0, ge=0)
     memory_bytes: int = Field(default=0, ge=0)
-    hit_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that hit, derived from hits and misses."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
 
 
 class CircuitBreakerMetrics(BaseModel):
@@ -231,7 +255,7 @@ class SystemMetrics(BaseModel):
 
 class BatchRequest(BaseModel):
     """Batch processing request."""
-    requests: List[ChatRequest] = Field(..., min_items=1, max_items=100)
+    requests: List[ChatRequest] = Field(..., min_length=1, max_length=100)
     parallel: bool = True
     max_concurrency: int = Field(default=10, ge=1, le=50)
 
@@ -255,13 +279,36 @@ class ErrorResponse(BaseModel):
     trace_id: Optional[str] = None
 
 
-class StreamChunk(BaseModel):
-    """Streaming response chunk."""
-    id: str
-    object: str = "chat.completion.chunk"
-    created: int
-    model: str
-    choices: List[Dict[str, Any]]
+if MSGSPEC_AVAILABLE:
+    class StreamChunk(msgspec.Struct, kw_only=True, frozen=True):
+        """Streaming response chunk (built once per token, so not validated)."""
+        id: str
+        object: str = "chat.completion.chunk"
+        created: int
+        model: str
+        choices: List[Dict[str, Any]]
+
+    # Encodes structs straight to JSON bytes, with no intermediate dict
+    encode_stream_chunk = msgspec.json.Encoder().encode
+else:
+    @dataclass(slots=True, frozen=True, kw_only=True)
+    class StreamChunk:
+        """Streaming response chunk (built once per token, so not validated)."""
+        id: str
+        object: str = "chat.completion.chunk"
+        created: int
+        model: str
+        choices: List[Dict[str, Any]]
+
+    def encode_stream_chunk(chunk: StreamChunk) -> bytes:
+        """Encode a stream chunk as compact JSON bytes for an SSE data line."""
+        return json.dumps({
+            "id": chunk.id,
+            "object": chunk.object,
+            "created": chunk.created,
+            "model": chunk.model,
+            "choices": chunk.choices,
+        }, separators=(",", ":")).encode()
 
 
 # Cost estimation models
@@ -287,3 +334,34 @@ class ProviderCapabilities(BaseModel):
     max_tokens: int
     max_context_length: int
     pricing_per_1k_tokens: Dict[str, float] = Field(default_factory=dict)
+
+
+# Request ingress. Models carry their compiled core validator, so these are
+# bound to it directly; the *_json forms validate raw bytes without building a dict
+validate_chat_request = ChatRequest.model_validate
+parse_chat_request = ChatRequest.model_validate_json
+parse_batch_request = BatchRequest.model_validate_json
+MESSAGES_ADAPTER = TypeAdapter(List[Message])
+validate_messages = MESSAGES_ADAPTER.validate_python
+parse_messages = MESSAGES_ADAPTER.validate_json
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert models and other non-JSON types for the encoders in to_json()."""
+    if isinstance(obj, BaseModel):
+        # orjson encodes datetimes and enums itself; json needs JSON-ready values
+        return obj.model_dump(mode="python" if ORJSON_AVAILABLE else "json")
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_json(obj: Any) -> bytes:
+    """Serialize a model (or containers of models) to JSON bytes."""
+    if isinstance(obj, StreamChunk):
+        return encode_stream_chunk(obj)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, default=_json_default, separators=(",", ":")).encode()
@@ -4,7 +4,11 @@ Production-Grade Observability System
 Structured logging, metrics collection, and distributed tracing support.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
 import time
 import json
 from typing import Optional, Dict, Any, Callable
@@ -20,6 +24,53 @@ trace_id_var: ContextVar[Optional[str]] = ContextVar('trace_id', default=None)
 span_id_var: ContextVar[Optional[str]] = ContextVar('span_id', default=None)
 
 
+class _StreamWriter(logging.StreamHandler):
+    """StreamHandler that writes without flushing; _BatchingQueueListener flushes."""
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers only once the queue drains."""
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+    def stop(self):
+        super().stop()
+        for handler in self.handlers:
+            # At exit the stream may already be closed (as logging.shutdown allows)
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                pass
+
+
+_log_queue: Optional[queue.SimpleQueue] = None
+_log_lock = threading.Lock()
+
+
+def _queue_handler() -> logging.Handler:
+    """Handler that queues records for the shared stdout writer thread."""
+    global _log_queue
+    with _log_lock:
+        if _log_queue is None:
+            _log_queue = queue.SimpleQueue()
+            writer = _StreamWriter(sys.stdout)
+            writer.setFormatter(StructuredFormatter())
+            listener = _BatchingQueueListener(_log_queue, writer)
+            listener.start()
+            atexit.register(listener.stop)
+    return logging.handlers.QueueHandler(_log_queue)
+
+
 class LogLevel(Enum):
     """Log levels."""
     DEBUG = "DEBUG"
@@ -58,11 +109,10 @@ class StructuredLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, level.value))
 
-        # Configure JSON formatter if not already configured
+        # Queue records for the background writer if not already configured,
+        # so callers never block on the stdout write
         if not self.logger.handlers:
-            handler = logging.StreamHandler(sys.stdout)
-            handler.setFormatter(StructuredFormatter())
-            self.logger.addHandler(handler)
+            self.logger.addHandler(_queue_handler())
 
     def _create_entry(
         self,
@@ -96,6 +146,10 @@ class StructuredLogger:
         import traceback
         return ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__))
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Check whether messages at a logging level would be emitted."""
+        return self.logger.isEnabledFor(level)
+
     def debug(self, message: str, **context):
         """Log debug message."""
         entry = self._create_entry("DEBUG", message, context)
@@ -40,7 +40,7 @@ from core.models import (
     ChatRequest, ChatResponse, Message, MessageRole, TokenUsage,
     Choice, AgentTask, AgentResult, SystemHealth, ComponentHealth, HealthStatus,
     SystemMetrics, PerformanceMetrics, CacheMetrics, ProviderMetrics,
-    BatchRequest, BatchResponse
+    BatchRequest, BatchResponse, validate_chat_request
 )
 
 
@@ -167,7 +167,7 @@ class KimiClientV2:
             if use_cache and self.cache and not stream:
                 cache_key_str = self._get_cache_key(chat_request)
                 try:
-                    cached_response = await self.cache.get(cache_key_str)
+                    cached_response = self.cache.get_nowait(cache_key_str)
                     self.logger.info("Cache hit", key=cache_key_str[:16])
                     if self.metrics:
                         self.metrics.counter("cache.hit", 1.0, provider=self.provider.value)
@@ -193,7 +193,7 @@ class KimiClientV2:
             # Cache response if enabled
             if use_cache and self.cache and not stream:
                 cache_key_str = self._get_cache_key(chat_request)
-                await self.cache.set(
+                self.cache.set_nowait(
                     cache_key_str,
                     response,
                     ttl=self.config.cache.default_ttl
@@ -348,42 +348,19 @@ class KimiClientV2:
         """
         start_time = time.time()
 
-        if batch_request.parallel:
-            # Execute in parallel with concurrency limit
-            semaphore = asyncio.Semaphore(batch_request.max_concurrency)
-
-            async def execute_with_semaphore(req):
-                async with semaphore:
-                    try:
-                        return await self.chat(
-                            messages=[{"role": m.role.value, "content": m.content} for m in req.messages],
-                            temperature=req.temperature,
-                            max_tokens=req.max_tokens,
-                            enable_swarm=req.enable_swarm
-                        )
-                    except Exception as e:
-                        self.logger.error(f"Batch request failed: {str(e)}", exc_info=e)
-                        return None
-
-            results = await asyncio.gather(
-                *[execute_with_semaphore(req) for req in batch_request.requests],
-                return_exceptions=False
-            )
-        else:
-            # Execute sequentially
-            results = []
-            for req in batch_request.requests:
-                try:
-                    result = await self.chat(
-                        messages=[{"role": m.role.value, "content": m.content} for m in req.messages],
-                        temperature=req.temperature,
-                        max_tokens=req.max_tokens,
-                        enable_swarm=req.enable_swarm
-                    )
-                    results.append(result)
-                except Exception as e:
-                    self.logger.error(f"Batch request failed: {str(e)}", exc_info=e)
-                    results.append(None)
+        requests = batch_request.requests
+        results: List[Optional[ChatResponse]] = [None] * len(requests)
+        pending = iter(enumerate(requests))
+
+        async def worker():
+            # Workers pull from one shared iterator, so at most
+            # `concurrency` requests are in flight without a semaphore
+            for index, req in pending:
+                results[index] = await self._execute_batch_item(req)
+
+        # Sequential execution is a single worker
+        concurrency = min(batch_request.max_concurrency, len(requests)) if batch_request.parallel else 1
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
 
         # Filter out failures
         successful_results = [r for r in results if r is not None]
@@ -399,6 +376,19 @@ class KimiClientV2:
             total_time_ms=duration
         )
 
+    async def _execute_batch_item(self, req: ChatRequest) -> Optional[ChatResponse]:
+        """Run one batch request, logging and returning None on failure."""
+        try:
+            return await self.chat(
+                messages=[{"role": m.role, "content": m.content} for m in req.messages],
+                temperature=req.temperature,
+                max_tokens=req.max_tokens,
+                enable_swarm=req.enable_swarm
+            )
+        except Exception as e:
+            self.logger.error(f"Batch request failed: {str(e)}", exc_info=e)
+            return None
+
     async def agent_swarm_task(
         self,
         task: str,
@@ -565,28 +555,21 @@ Parallel execution: {self.config.agent_swarm.parallel_execution}
     # Helper methods
     def _build_chat_request(self, messages, temperature=None, max_tokens=None, stream=False, enable_swarm=False) -> ChatRequest:
         """Build and validate chat request."""
-        pydantic_messages = [
-            Message(
-                role=MessageRole(msg["role"]),
-                content=msg["content"]
-            )
-            for msg in messages
-        ]
-
-        return ChatRequest(
-            messages=pydantic_messages,
-            temperature=temperature or self.provider_config.temperature,
-            max_tokens=max_tokens or self.provider_config.max_tokens,
-            stream=stream,
-            enable_swarm=enable_swarm
-        )
+        # Message dicts are validated by the core validator in one call
+        return validate_chat_request({
+            "messages": messages,
+            "temperature": temperature or self.provider_config.temperature,
+            "max_tokens": max_tokens or self.provider_config.max_tokens,
+            "stream": stream,
+            "enable_swarm": enable_swarm
+        })
 
     def _get_cache_key(self, request: ChatRequest) -> str:
         """Generate cache key from request."""
         return cache_key(
             self.provider.value,
             self.provider_config.model,
-            [{"role": m.role.value, "content": m.content} for m in request.messages],
+            [{"role": m.role, "content": m.content} for m in request.messages],
             request.temperature,
             request.max_tokens
         )
@@ -181,6 +181,8 @@ class RAGVectorStore:
         self.store_type = store_type
         self.collection_name = collection_name
         self.embedding_provider = embedding_provider or EmbeddingProvider()
+        # Bumped on every change, so cached search results can be checked for staleness
+        self.version = 0
 
         # Initialize backend
         if store_type == VectorStoreType.CHROMA:
@@ -276,6 +278,7 @@ class RAGVectorStore:
             )
         else:  # IN_MEMORY
             await self.backend.add_documents(documents)
+        self.version += 1
 
     async def search(
         self,
@@ -364,6 +367,7 @@ class RAGVectorStore:
             )
         else:
             await self.backend.delete(doc_id)
+        self.version += 1
 
     async def clear(self):
         """Clear all documents"""
@@ -375,6 +379,7 @@ class RAGVectorStore:
             self._init_qdrant()
         else:
             await self.backend.clear()
+        self.version += 1
 
 
 # Example usage
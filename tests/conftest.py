@@ -0,0 +1,7 @@
+"""Shared pytest setup for the unit tests."""
+
+import os
+
+# core.config validates provider keys at import time; unit tests never reach a provider
+os.environ.setdefault("MOONSHOT_API_KEY", "test-key")
+os.environ.setdefault("TOGETHER_API_KEY", "test-key")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the advanced orchestrator's swarm configuration and prompts.
+"""
+
+import asyncio
+import dataclasses
+
+import pytest
+
+from advanced_orchestrator import (
+    AdvancedOrchestrator,
+    AgentAssignment,
+    SwarmConfiguration,
+    TaskComplexity,
+    _build_prompt,
+    _layout_key,
+)
+from agent_skills_library import AgentRole, AgentSkillsLibrary, TaskType
+from kimi_client import KimiClient
+
+
+@pytest.fixture(scope="module")
+def library():
+    return AgentSkillsLibrary()
+
+
+def _config(library, count=10, priority=1, roles=(AgentRole.SECURITY_AUDITOR,)):
+    assignments = [
+        AgentAssignment(
+            agent_template=library.get_agent_by_role(role),
+            count=count,
+            priority=priority
+        )
+        for role in roles
+    ]
+    return SwarmConfiguration(
+        task_description="Audit the service",
+        complexity=TaskComplexity.HIGH,
+        agent_assignments=assignments,
+        total_agents=count * len(assignments),
+        execution_strategy="parallel"
+    )
+
+
+@pytest.mark.parametrize("count,priority", [(200, 1), (10, 500), (10, -300)])
+def test_prompt_accepts_large_counts_and_priorities(library, count, priority):
+    """Counts and priorities outside the 8-bit range still render."""
+    prompt = _build_prompt(_config(library, count=count, priority=priority))
+    assert f"(Priority: {priority}) - {count} agents" in prompt
+
+
+def test_layout_key_uses_roles_for_library_templates(library):
+    """Library templates are keyed by role rather than by their full value."""
+    config = _config(library, count=4, priority=2)
+    config.agent_assignments[0].specific_tasks = ["scan"]
+
+    assert _layout_key(config) == ((AgentRole.SECURITY_AUDITOR, 4, 2, ("scan",)),)
+
+
+def test_custom_template_with_library_role_renders_its_own_fields(library):
+    """A custom template sharing a library role is not served the library's section."""
+    config = _config(library)
+    library_prompt = _build_prompt(config)
+    custom = dataclasses.replace(
+        library.get_agent_by_role(AgentRole.SECURITY_AUDITOR),
+        name="Custom Auditor",
+        primary_focus="Supply chain"
+    )
+    config.agent_assignments[0].agent_template = custom
+
+    prompt = _build_prompt(config)
+
+    assert _layout_key(config)[0][0] is custom
+    assert "### Custom Auditor" in prompt
+    assert "**Focus**: Supply chain" in prompt
+    assert "Supply chain" not in library_prompt
+
+
+@pytest.mark.asyncio
+async def test_orchestrators_do_not_share_clients_by_default():
+    """Each orchestrator creates, and closes, its own client."""
+    first = AdvancedOrchestrator()
+    second = AdvancedOrchestrator()
+    assert first.client is not second.client
+
+    await first.close()
+    assert first.client.client.is_closed
+    assert not second.client.client.is_closed
+
+    await second.close()
+    assert second.client.client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_close_is_idempotent():
+    """Closing twice is a no-op the second time."""
+    async with AdvancedOrchestrator() as orchestrator:
+        pass
+    await orchestrator.close()
+    assert orchestrator.client.client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_injected_client_is_shared_and_left_open():
+    """An injected client is shared and stays owned by the caller."""
+    client = KimiClient()
+    first = AdvancedOrchestrator(client=client)
+    second = AdvancedOrchestrator(client=client)
+    assert first.client is second.client is client
+
+    await first.close()
+    await second.close()
+    assert not client.client.is_closed
+
+    await client.close()
+
+
+class _RecordingClient:
+    """Stands in for KimiClient, failing tasks whose prompt contains "fail"."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = 0
+
+    async def agent_swarm_task(self, task, context, max_agents):
+        self.calls += 1
+        if "fail" in task:
+            raise RuntimeError("swarm failed")
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"agents": max_agents}
+
+
+def _task_config(library, task, count=10):
+    config = _config(library, count=count)
+    config.task_description = task
+    return config
+
+
+@pytest.mark.asyncio
+async def test_execute_many_without_fail_fast_returns_failures_in_order(library):
+    """Without fail_fast, every swarm runs and failures are returned in place."""
+    orchestrator = AdvancedOrchestrator(client=_RecordingClient())
+    configs = [
+        _task_config(library, "first", count=1),
+        _task_config(library, "fail here"),
+        _task_config(library, "third", count=3),
+    ]
+
+    results = await orchestrator.execute_many(configs, fail_fast=False)
+
+    assert results[0] == {"agents": 1}
+    assert isinstance(results[1], RuntimeError)
+    assert results[2] == {"agents": 3}
+
+
+@pytest.mark.asyncio
+async def test_execute_many_fail_fast_cancels_the_rest(library):
+    """With fail_fast, the first failure cancels the other swarms."""
+    client = _RecordingClient(delay=10)
+    orchestrator = AdvancedOrchestrator(client=client)
+    configs = [_task_config(library, "slow"), _task_config(library, "fail here")]
+
+    with pytest.raises(ExceptionGroup) as excinfo:
+        await orchestrator.execute_many(configs)
+
+    assert excinfo.group_contains(RuntimeError)
+    assert client.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_recommended_swarm_uses_library_recommendations(library):
+    """Recommended swarms are built from the library's recommended roles."""
+    client = _RecordingClient()
+    orchestrator = AdvancedOrchestrator(client=client)
+    roles = [
+        template.role
+        for template in library.recommend_agents_for_task(TaskType.SECURITY_AUDIT, "medium")
+    ]
+    expected = orchestrator.create_swarm_config("audit", TaskComplexity.MEDIUM, roles)
+
+    result = await orchestrator.execute_recommended_swarm("audit", TaskType.SECURITY_AUDIT)
+
+    assert roles
+    assert result == {"agents": expected.total_agents}
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the agent skills library.
+"""
+
+import pytest
+
+from agent_skills_library import AgentRole, AgentSkillsLibrary, TaskType
+
+
+@pytest.mark.parametrize("role", list(AgentRole))
+def test_get_collaborators_matches_works_best_with(role):
+    """Collaborators are exactly the templates that list the role, in catalog order."""
+    expected = tuple(
+        template.role
+        for template in AgentSkillsLibrary.get_all_agents().values()
+        if role in template.works_best_with
+    )
+    assert AgentSkillsLibrary.get_collaborators(role) == expected
+
+
+def test_get_collaborators_is_not_empty_for_listed_partners():
+    """Every partner named in works_best_with has at least one collaborator."""
+    partners = {
+        partner
+        for template in AgentSkillsLibrary.get_all_agents().values()
+        for partner in template.works_best_with
+    }
+    assert partners
+    for partner in partners:
+        assert AgentSkillsLibrary.get_collaborators(partner)
+
+
+def test_recommend_agents_bulk_matches_single_calls():
+    """Bulk recommendations equal per-pair recommend_agents_for_task results."""
+    task_types = [TaskType.SECURITY_AUDIT, "research", "unknown", TaskType.MARKET_ANALYSIS]
+    complexities = ["high", "low", "medium", "extreme"]
+
+    bulk = AgentSkillsLibrary.recommend_agents_bulk(task_types, complexities)
+
+    assert bulk == [
+        AgentSkillsLibrary.recommend_agents_for_task(task_type, complexity)
+        for task_type, complexity in zip(task_types, complexities)
+    ]
+    assert bulk[2] == []
+
+
+def test_recommendations_are_independent_lists():
+    """Callers can modify returned lists without affecting the cached table."""
+    first = AgentSkillsLibrary.recommend_agents_bulk(["research"], ["medium"])[0]
+    first.clear()
+
+    assert AgentSkillsLibrary.recommend_agents_bulk(["research"], ["medium"])[0]
+    assert AgentSkillsLibrary.recommend_agents_for_task("research", "medium")
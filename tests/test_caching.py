@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Unit tests for core.caching.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.caching import LRUCache, MultiLevelCache, _memoize_async, cached
+from core.exceptions import CacheMissError
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_async_api():
+    """get/set/delete/clear stay awaitable."""
+    cache = LRUCache(max_size=10)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.get("a") == 1
+
+    await cache.delete("a")
+    with pytest.raises(CacheMissError):
+        await cache.get("a")
+
+    await cache.clear()
+    with pytest.raises(CacheMissError):
+        await cache.get("b")
+
+
+def test_lru_cache_nowait_api():
+    """The *_nowait methods work without an event loop."""
+    cache = LRUCache(max_size=10)
+
+    cache.set_nowait("a", 1)
+    cache.set_nowait("b", 2)
+    assert cache.get_nowait("a") == 1
+
+    cache.delete_nowait("a")
+    with pytest.raises(CacheMissError):
+        cache.get_nowait("a")
+
+    cache.clear_nowait()
+    with pytest.raises(CacheMissError):
+        cache.get_nowait("b")
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_paths_share_entries():
+    """Entries written through one path are visible through the other."""
+    cache = LRUCache(max_size=10)
+
+    cache.set_nowait("sync", "s")
+    await cache.set("async", "a")
+
+    assert await cache.get("sync") == "s"
+    assert cache.get_nowait("async") == "a"
+
+
+def test_lru_cache_stats_are_pure_reads():
+    """Reading hits/misses does not change them."""
+    cache = LRUCache(max_size=10)
+    cache.set_nowait("a", 1)
+    cache.get_nowait("a")
+    with pytest.raises(CacheMissError):
+        cache.get_nowait("b")
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get_hit_rate() == 0.5
+
+
+def test_lru_cache_stats_count_concurrent_lookups():
+    """Lookups from several threads are all counted."""
+    cache = LRUCache(max_size=10)
+    cache.set_nowait("a", 1)
+
+    def worker():
+        for _ in range(1000):
+            cache.get_nowait("a")
+            try:
+                cache.get_nowait("missing")
+            except CacheMissError:
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.hits == 4000
+    assert cache.misses == 4000
+
+
+def test_lru_cache_reset_stats():
+    """reset_stats() zeroes the counters but keeps entries."""
+    cache = LRUCache(max_size=1)
+    cache.set_nowait("a", 1)
+    cache.set_nowait("b", 2)
+    cache.get_nowait("b")
+    with pytest.raises(CacheMissError):
+        cache.get_nowait("a")
+
+    cache.reset_stats()
+
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+    assert cache.get_nowait("b") == 2
+
+
+@pytest.mark.asyncio
+async def test_multi_level_cache_writes_l2_behind():
+    """L2 writes are applied on the next loop iteration, or by flush()."""
+    cache = MultiLevelCache()
+
+    await cache.set("a", 1)
+    assert "a" not in cache.l2_cache._cache
+    await asyncio.sleep(0)
+    assert cache.l2_cache.get_nowait("a") == 1
+
+    await cache.set("b", 2)
+    cache.flush()
+    assert cache.l2_cache.get_nowait("b") == 2
+
+
+@pytest.mark.asyncio
+async def test_multi_level_cache_counts_pending_hits():
+    """A hit served from the write-behind buffer counts as an L2 hit."""
+    cache = MultiLevelCache()
+
+    await cache.set("a", 1)
+    cache.l1_cache.delete_nowait("a")
+
+    assert await cache.get("a") == 1
+    assert cache.l1_cache.misses == 1
+    assert cache.l2_cache.hits == 1
+    assert cache.get_stats()["combined_hit_rate"] == 1.0
+    # Promoted back to L1
+    assert await cache.get("a") == 1
+    assert cache.l1_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_multi_level_cache_clear_drops_pending_writes():
+    """clear() empties both levels and the write-behind buffer."""
+    cache = MultiLevelCache()
+
+    await cache.set("a", 1)
+    await cache.clear()
+    cache.flush()
+
+    with pytest.raises(CacheMissError):
+        await cache.get("a")
+
+
+def test_caches_accept_a_shared_lock():
+    """A lock passed to the constructor is used instead of a new one."""
+    lock = threading.Lock()
+    caches = [LRUCache(lock=lock), LRUCache(lock=lock)]
+
+    for cache in caches:
+        assert cache._lock is lock
+        cache.set_nowait("a", 1)
+        assert cache.get_nowait("a") == 1
+
+    multi = MultiLevelCache()
+    assert multi.l1_cache._lock is multi.l2_cache._lock is multi._lock
+
+
+class _GatedCall:
+    """Counts calls to an async function that blocks until released."""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.release = asyncio.Event()
+
+    def function(self):
+        async def double(x):
+            self.calls += 1
+            await self.release.wait()
+            if self.error is not None:
+                raise self.error
+            return x * 2
+        return double
+
+
+async def _start(func, n, *args):
+    """Start n concurrent calls and let them reach the shared await."""
+    tasks = [asyncio.create_task(func(*args)) for _ in range(n)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("decorator", [cached(), cached(ttl=60)])
+async def test_concurrent_misses_share_one_call(decorator):
+    """Concurrent callers for one key collapse into a single call."""
+    gated = _GatedCall()
+    func = decorator(gated.function())
+
+    tasks = await _start(func, 5, 21)
+    gated.release.set()
+
+    assert await asyncio.gather(*tasks) == [42] * 5
+    assert gated.calls == 1
+    assert await func(21) == 42
+    assert gated.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_error_reaches_every_waiter():
+    """A failing shared call raises in every waiter and is not cached."""
+    gated = _GatedCall(error=ValueError("boom"))
+    func = cached()(gated.function())
+
+    tasks = await _start(func, 3, 1)
+    gated.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert gated.calls == 1
+
+    gated.error = None
+    assert await func(1) == 2
+    assert gated.calls == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cancelled", [0, 1])
+async def test_cancelling_one_waiter_leaves_the_others(cancelled):
+    """Cancelling a waiter, the first caller included, does not cancel the call."""
+    gated = _GatedCall()
+    func = cached()(gated.function())
+
+    tasks = await _start(func, 3, 5)
+    tasks[cancelled].cancel()
+    await asyncio.sleep(0)
+    gated.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert isinstance(results[cancelled], asyncio.CancelledError)
+    assert [r for i, r in enumerate(results) if i != cancelled] == [10, 10]
+    assert gated.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_async_memoize_evicts_least_recently_used():
+    """The async memo keeps at most maxsize results, dropping the LRU one."""
+    calls = []
+
+    async def double(x):
+        calls.append(x)
+        return x * 2
+
+    func = _memoize_async(double, maxsize=2)
+
+    await func(1)
+    await func(2)
+    await func(1)  # 1 is now more recent than 2
+    await func(3)  # evicts 2
+    await func(1)
+    await func(2)
+
+    assert calls == [1, 2, 3, 2]
+
+
+def test_sync_memoize_bypasses_unhashable_args():
+    """Unhashable arguments are computed each time instead of failing."""
+    calls = []
+
+    @cached()
+    def total(values):
+        calls.append(values)
+        return sum(values)
+
+    assert total([1, 2]) == 3
+    assert total([1, 2]) == 3
+    assert total((1, 2)) == 3
+    assert total((1, 2)) == 3
+
+    assert calls == [[1, 2], [1, 2], (1, 2)]
+
+
+def test_sync_memoize_keeps_equal_numbers_of_other_types_apart():
+    """True, 1 and 1.0 hash alike but are memoized separately."""
+    @cached()
+    def describe(x, scale=1):
+        return f"{x!r}*{scale!r}"
+
+    assert describe(True) == "True*1"
+    assert describe(1.0) == "1.0*1"
+    assert describe(1) == "1*1"
+    assert describe(1, scale=True) == "1*True"
+    assert describe(1, scale=1.0) == "1*1.0"
+
+
+@pytest.mark.asyncio
+async def test_async_memoize_keeps_equal_numbers_of_other_types_apart():
+    """True, 1 and 1.0 hash alike but are memoized separately."""
+    @cached()
+    async def describe(x):
+        return repr(x)
+
+    assert [await describe(True), await describe(1.0), await describe(1)] == [
+        "True", "1.0", "1"
+    ]
+
+
+def _counting(calls):
+    def square(x):
+        calls.append(x)
+        return x * x
+    return square
+
+
+def _counting_async(calls):
+    async def square(x):
+        calls.append(x)
+        return x * x
+    return square
+
+
+def test_cached_sync_without_cache_or_ttl_memoizes():
+    """With no cache or TTL, sync functions are memoized via lru_cache."""
+    calls = []
+    square = cached()(_counting(calls))
+
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    assert calls == [3, 4]
+    assert not hasattr(square, "cache")
+
+    square.cache_clear()
+    square(3)
+    assert calls == [3, 4, 3]
+
+
+@pytest.mark.asyncio
+async def test_cached_async_without_cache_or_ttl_memoizes():
+    """With no cache or TTL, async functions are memoized in a dict."""
+    calls = []
+    square = cached()(_counting_async(calls))
+
+    assert [await square(3), await square(3), await square(4)] == [9, 9, 16]
+    assert calls == [3, 4]
+    assert not hasattr(square, "cache")
+
+
+def test_cached_sync_with_explicit_cache():
+    """A sync function with an explicit cache stores results in it."""
+    calls = []
+    cache = LRUCache()
+    square = cached(cache=cache, key_prefix="sq")(_counting(calls))
+
+    assert [square(3), square(3)] == [9, 9]
+    assert calls == [3]
+    assert square.cache is cache
+    assert len(cache._cache) == 1
+    assert next(iter(cache._cache)).startswith("sq:")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cached_async_with_explicit_cache():
+    """An async function with an explicit cache stores results in it."""
+    calls = []
+    cache = LRUCache()
+    square = cached(cache=cache)(_counting_async(calls))
+
+    assert [await square(3), await square(3)] == [9, 9]
+    assert calls == [3]
+    assert square.cache is cache
+    assert next(iter(cache._cache)).startswith("square:")
+
+
+def test_cached_sync_with_ttl_expires():
+    """With a TTL, a sync result is recomputed once it expires."""
+    calls = []
+    square = cached(ttl=0.05)(_counting(calls))
+
+    square(3)
+    square(3)
+    assert calls == [3]
+    assert isinstance(square.cache, LRUCache)
+
+    time.sleep(0.1)
+    square(3)
+    assert calls == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_cached_async_with_ttl_expires():
+    """With a TTL, an async result is recomputed once it expires."""
+    calls = []
+    square = cached(ttl=0.05)(_counting_async(calls))
+
+    await square(3)
+    await square(3)
+    assert calls == [3]
+
+    await asyncio.sleep(0.1)
+    await square(3)
+    assert calls == [3, 3]
+
+
+def test_lru_eviction_order():
+    """The least recently used entry is evicted first."""
+    cache = LRUCache(max_size=2)
+    cache.set_nowait("a", 1)
+    cache.set_nowait("b", 2)
+    cache.get_nowait("a")
+    cache.set_nowait("c", 3)
+
+    with pytest.raises(CacheMissError):
+        cache.get_nowait("b")
+    assert cache.get_nowait("a") == 1
+    assert cache.get_nowait("c") == 3
+    assert cache.evictions == 1
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Unit tests for core.config.
+"""
+
+import json
+
+from core.config import ConfigManager, KimiConfig
+
+
+def test_to_json_matches_redacted_to_dict():
+    """to_json() encodes the redacted to_dict() output."""
+    config = KimiConfig()
+    config.moonshot.api_key = "secret-key"
+    config.clear_dict_cache()
+
+    encoded = config.to_json()
+
+    assert b"secret-key" not in encoded
+    assert json.loads(encoded) == json.loads(json.dumps(config.to_dict(), default=str))
+    assert json.loads(encoded)["moonshot"]["api_key"] == "***REDACTED***"
+
+
+def test_to_json_is_cached_until_cleared():
+    """to_json() reuses its bytes until clear_dict_cache()."""
+    config = KimiConfig()
+
+    first = config.to_json()
+    assert config.to_json() is first
+
+    config.debug = not config.debug
+    config.clear_dict_cache()
+    assert json.loads(config.to_json())["debug"] == config.debug
+
+
+def test_config_manager_update_refreshes_serialized():
+    """ConfigManager.update() invalidates the cached JSON."""
+    manager = ConfigManager(KimiConfig())
+    before = json.loads(manager.serialized())
+
+    manager.update(connection_pool_size=before["connection_pool_size"] + 1)
+
+    after = json.loads(manager.serialized())
+    assert after["connection_pool_size"] == before["connection_pool_size"] + 1
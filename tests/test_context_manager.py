@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Unit tests for cag.context_manager.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from cag import context_manager
+from cag.context_manager import (
+    ContextAugmentationEngine,
+    ContextEntry,
+    ContextManager,
+    ContextType,
+    ContextWindow,
+)
+from rag.vector_store import Document
+
+
+def test_entry_accepts_datetime_times():
+    """timestamp/expires_at keywords still take naive UTC datetimes."""
+    created = datetime(2024, 1, 1, 12, 0, 0)
+    expires = created + timedelta(minutes=5)
+    entry = ContextEntry(
+        id="a",
+        type=ContextType.TASK,
+        content="one two three",
+        timestamp=created,
+        expires_at=expires
+    )
+
+    assert entry.timestamp == created
+    assert entry.expires_at == expires
+    assert entry.is_expired()
+    assert entry.to_dict()["timestamp"] == created.isoformat()
+
+
+def test_entry_accepts_epoch_seconds():
+    """timestamp/expires_at keywords also take epoch seconds."""
+    entry = ContextEntry(
+        id="a",
+        type=ContextType.TASK,
+        content="text",
+        timestamp=1_700_000_000.5,
+        expires_at=time.time() + 60
+    )
+
+    assert entry.timestamp_ns == 1_700_000_000_500_000_000
+    assert entry.timestamp == datetime(2023, 11, 14, 22, 13, 20, 500000)
+    assert not entry.is_expired()
+
+
+def test_entry_without_expiry():
+    """Entries default to the current time and no expiry."""
+    before = time.time_ns()
+    entry = ContextEntry(id="a", type=ContextType.TASK, content="text")
+
+    assert entry.timestamp_ns >= before
+    assert entry.expires_at is None
+    assert not entry.is_expired()
+
+
+def _entry(entry_id, relevance=1.0, **kwargs):
+    return ContextEntry(
+        id=entry_id,
+        type=ContextType.TASK,
+        content="text",
+        relevance_score=relevance,
+        **kwargs
+    )
+
+
+def test_window_accepts_entries_in_constructor():
+    """ContextWindow(entries=[...]) keeps the entries in insertion order."""
+    entries = [_entry("a"), _entry("b"), _entry("c")]
+    window = ContextWindow(entries=entries)
+
+    assert window.entries == entries
+    assert ContextWindow() == ContextWindow()
+
+
+def test_window_entries_assignment_replaces_and_bounds():
+    """Assigning entries replaces them, trimming to max_entries by relevance."""
+    window = ContextWindow(max_entries=2)
+    window.add(_entry("old"))
+
+    window.entries = [_entry("low", 0.1), _entry("high", 0.9), _entry("mid", 0.5)]
+
+    assert [e.id for e in window.entries] == ["high", "mid"]
+
+
+def test_window_entries_skips_expired():
+    """Expired entries are hidden from entries and get_context."""
+    window = ContextWindow(entries=[
+        _entry("live"),
+        _entry("gone", expires_at=time.time() - 1)
+    ])
+
+    assert [e.id for e in window.entries] == ["live"]
+    assert [e.id for e in window.get_context()] == ["live"]
+
+
+def test_window_evicts_oldest_entry_on_relevance_ties():
+    """With equal relevance, the oldest entry is evicted first."""
+    window = ContextWindow(max_entries=2)
+    for i, entry_id in enumerate(["a", "b", "c"]):
+        window.add(_entry(entry_id, timestamp_ns=1_000 + i))
+
+    assert [e.id for e in window.entries] == ["b", "c"]
+
+
+def test_window_evicts_first_inserted_on_full_ties():
+    """With equal relevance and timestamp, the first inserted entry goes first."""
+    window = ContextWindow(max_entries=2)
+    for entry_id in ["a", "b", "c"]:
+        window.add(_entry(entry_id, timestamp_ns=1_000))
+
+    assert [e.id for e in window.entries] == ["b", "c"]
+    assert [e.id for e in window.get_context()] == ["b", "c"]
+
+
+def test_get_context_orders_by_relevance_then_recency():
+    """get_context returns the most relevant, then most recent, entries first."""
+    window = ContextWindow(entries=[
+        _entry("old", 0.5, timestamp_ns=1_000),
+        _entry("new", 0.5, timestamp_ns=2_000),
+        _entry("top", 0.9, timestamp_ns=500),
+    ])
+
+    assert [e.id for e in window.get_context()] == ["top", "new", "old"]
+
+
+_DOCUMENTS = [
+    Document(id="py", content="Python is a programming language"),
+    Document(id="rs", content="Rust guarantees memory safety"),
+    Document(id="go", content="Go has goroutines for concurrency"),
+]
+
+_HISTORY = [
+    {"role": "user", "content": "Tell me about languages"},
+    {"role": "assistant", "content": "Which ones?"},
+]
+
+
+async def _engine():
+    engine = ContextAugmentationEngine()
+    await engine.add_knowledge(list(_DOCUMENTS))
+    return engine
+
+
+def _shape(augmented):
+    """Prompt plus (id, type, content) of each entry, ignoring timestamps."""
+    prompt, entries = augmented
+    return prompt, [(e.id, e.type, e.content) for e in entries]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queries", [["python"], ["python", "memory safety", "goroutines"]])
+async def test_augment_queries_matches_augment_query(queries):
+    """Batch augmentation gives the same result as one call per query."""
+    engine = await _engine()
+    batch = await engine.augment_queries(queries, _HISTORY, k_retrieved=2)
+    single = [await engine.augment_query(q, _HISTORY, k_retrieved=2) for q in queries]
+
+    assert [_shape(a) for a in batch] == [_shape(a) for a in single]
+    for query, (prompt, entries) in zip(queries, batch):
+        assert [e.type for e in entries].count(ContextType.KNOWLEDGE) == 2
+        assert prompt.endswith(f"# Current Query\n{query}")
+
+
+@pytest.mark.asyncio
+async def test_augment_queries_without_knowledge():
+    """With retrieval off, only conversation context is added."""
+    engine = await _engine()
+    batch = await engine.augment_queries(["a", "b"], _HISTORY, retrieve_knowledge=False)
+
+    for _, entries in batch:
+        assert {e.type for e in entries} == {ContextType.CONVERSATION}
+
+
+def _count_searches(engine, monkeypatch):
+    """Record each query that reaches the vector store."""
+    searched = []
+    search = engine.vector_store.search
+
+    async def counting_search(query, **kwargs):
+        searched.append(query)
+        return await search(query, **kwargs)
+
+    monkeypatch.setattr(engine.vector_store, "search", counting_search)
+    return searched
+
+
+def _knowledge(augmented):
+    """Contents of the retrieved knowledge entries."""
+    _, entries = augmented
+    return [e.content for e in entries if e.type is ContextType.KNOWLEDGE]
+
+
+@pytest.mark.asyncio
+async def test_search_cache_reuses_recent_results(monkeypatch):
+    """A repeated (query, k) within the TTL skips the vector store."""
+    engine = await _engine()
+    searched = _count_searches(engine, monkeypatch)
+
+    first = await engine.augment_query("python", k_retrieved=2)
+    second = await engine.augment_query("python", k_retrieved=2)
+    await engine.augment_query("python", k_retrieved=1)
+
+    assert searched == ["python", "python"]
+    assert _knowledge(first) == _knowledge(second)
+
+
+@pytest.mark.asyncio
+async def test_search_cache_expires_after_ttl(monkeypatch):
+    """Results older than the TTL are fetched again."""
+    engine = await _engine()
+    searched = _count_searches(engine, monkeypatch)
+    now_ns = time.monotonic_ns()
+    monkeypatch.setattr(time, "monotonic_ns", lambda: now_ns)
+
+    await engine.augment_query("python")
+    now_ns += context_manager._SEARCH_CACHE_TTL_NS - 1
+    await engine.augment_query("python")
+    now_ns += 1
+    await engine.augment_query("python")
+
+    assert searched == ["python", "python"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("change", ["add", "delete", "clear"])
+async def test_search_cache_invalidated_by_direct_store_changes(monkeypatch, change):
+    """Changing vector_store directly drops cached results."""
+    engine = await _engine()
+    searched = _count_searches(engine, monkeypatch)
+    store = engine.vector_store
+
+    before = await engine.augment_query("python", k_retrieved=len(_DOCUMENTS) + 1)
+    if change == "add":
+        await store.add_documents([Document(id="new", content="python packaging")])
+    elif change == "delete":
+        await store.delete(_DOCUMENTS[0].id)
+    else:
+        await store.clear()
+    after = await engine.augment_query("python", k_retrieved=len(_DOCUMENTS) + 1)
+
+    assert searched == ["python", "python"]
+    expected = {
+        "add": set(_knowledge(before)) | {"python packaging"},
+        "delete": set(_knowledge(before)) - {_DOCUMENTS[0].content},
+        "clear": set(),
+    }[change]
+    assert set(_knowledge(after)) == expected
+
+
+async def _manager():
+    manager = ContextManager()
+    await manager.add_knowledge(list(_DOCUMENTS))
+    manager.add_user_message("Tell me about languages")
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_process_queries_matches_process_query():
+    """Batch processing gives each query the same prompt and metadata."""
+    queries = ["python", "memory safety"]
+    batch_manager = await _manager()
+    single_manager = await _manager()
+
+    batch = await batch_manager.process_queries(queries)
+    single = [await single_manager.process_query(q) for q in queries]
+
+    assert [prompt for prompt, _ in batch] == [prompt for prompt, _ in single]
+    for (_, batch_meta), (_, single_meta), query in zip(batch, single, queries):
+        batch_meta.pop("session_id")
+        single_meta.pop("session_id")
+        assert batch_meta == single_meta
+        assert batch_meta["query"] == query
+        assert batch_meta["context_types"] == ["conversation", "knowledge"]
+
+
+@pytest.mark.asyncio
+async def test_process_queries_records_context_for_every_query():
+    """Each query's entries are added to the context window."""
+    manager = await _manager()
+
+    results = await manager.process_queries(["python", "goroutines"])
+
+    recorded = sum(meta["context_entries"] for _, meta in results)
+    assert len(manager.context_window.entries) == recorded
+    assert manager.get_context_summary()["total_entries"] == recorded
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_entry_to_json_matches_to_dict(monkeypatch, use_orjson):
+    """to_json() encodes to_dict() as UTF-8 JSON, with or without orjson."""
+    if use_orjson and not context_manager.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(context_manager, "ORJSON_AVAILABLE", use_orjson)
+    entry = _entry("ü", metadata={"lang": "日本語"})
+
+    encoded = entry.to_json()
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == json.loads(json.dumps(entry.to_dict()))
+    assert "日本語".encode() in encoded
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for core.exceptions.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from core import exceptions
+from core.exceptions import (
+    AuthenticationError,
+    ConnectionError,
+    KimiError,
+    NetworkError,
+    ProviderResponseError,
+    ProviderUnavailableError,
+    QuotaExceededError,
+    RateLimitError,
+    ResourceError,
+)
+
+
+def test_default_context_is_writable_per_instance():
+    """Handlers can enrich an error's default context without affecting others."""
+    first = NetworkError("first")
+    second = KimiError("second")
+
+    first.context["request_id"] = "abc"
+
+    assert first.to_dict()["context"] == {"request_id": "abc"}
+    assert second.context == {}
+
+
+@pytest.mark.parametrize("error", [
+    AuthenticationError("denied", "moonshot"),
+    ConnectionError("moonshot"),
+    RateLimitError("moonshot", retry_after=5),
+    ProviderUnavailableError("moonshot", status_code=503),
+    ProviderResponseError("moonshot", 500, "oops"),
+    QuotaExceededError("tokens", "moonshot"),
+])
+def test_provider_is_in_context_and_attribute(error):
+    """Provider-scoped errors expose the provider both ways."""
+    assert error.provider == "moonshot"
+    assert error.context["provider"] == "moonshot"
+    assert error.to_dict()["context"]["provider"] == "moonshot"
+
+
+def test_provider_errors_keep_their_base_classes():
+    """Mixing in the provider base does not change categories."""
+    assert isinstance(ConnectionError("p"), NetworkError)
+    assert isinstance(QuotaExceededError("t", "p"), ResourceError)
+    assert ConnectionError("p").to_dict()["category"] == "network"
+    assert QuotaExceededError("t", "p").to_dict()["category"] == "resource"
+
+
+def test_provider_error_does_not_mutate_caller_context():
+    """The caller's context dict is copied, not written into."""
+    context = {"attempt": 2}
+    error = AuthenticationError("denied", "moonshot", context=context)
+
+    assert context == {"attempt": 2}
+    assert error.context == {"attempt": 2, "provider": "moonshot"}
+
+
+def test_error_type_is_the_concrete_class_name():
+    """error_type names the raised class, including subclasses defined later."""
+    class CustomError(NetworkError):
+        pass
+
+    assert KimiError("m").to_dict()["error_type"] == "KimiError"
+    assert RateLimitError("p").to_dict()["error_type"] == "RateLimitError"
+    assert CustomError("m").to_dict()["error_type"] == "CustomError"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_to_json_matches_to_dict(monkeypatch, use_orjson):
+    """to_json() encodes to_dict(), stringifying values JSON cannot hold."""
+    if use_orjson and not exceptions.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(exceptions, "ORJSON_AVAILABLE", use_orjson)
+    when = datetime(2024, 1, 1)
+    error = KimiError(
+        "failed",
+        context={"when": when, "attempt": 2},
+        original_error=ValueError("boom")
+    )
+
+    decoded = json.loads(error.to_json())
+
+    # orjson encodes datetimes natively; the json fallback uses str()
+    encoded_when = when.isoformat() if use_orjson else str(when)
+    assert decoded == {**error.to_dict(), "context": {"when": encoded_when, "attempt": 2}}
+    assert decoded["original_error"] == "boom"
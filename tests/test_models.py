@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Unit tests for core.models.
+"""
+
+import dataclasses
+import json
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from core import models
+from core.models import (
+    BatchRequest,
+    ChatRequest,
+    ChatResponse,
+    Choice,
+    ErrorResponse,
+    Message,
+    StreamChunk,
+    TokenUsage,
+    encode_stream_chunk,
+    parse_batch_request,
+    parse_chat_request,
+    parse_messages,
+    to_json,
+    validate_chat_request,
+    validate_messages,
+)
+
+
+def _chunk():
+    return StreamChunk(
+        id="chunk-1",
+        created=1700000000,
+        model="kimi",
+        choices=[{"index": 0, "delta": {"content": "Hi"}}]
+    )
+
+
+def test_stream_chunk_is_keyword_only_and_frozen():
+    """Chunks are built by keyword and cannot be modified."""
+    chunk = _chunk()
+
+    assert chunk.object == "chat.completion.chunk"
+    with pytest.raises(TypeError):
+        StreamChunk("chunk-1", "chat.completion.chunk", 1700000000, "kimi", [])
+    with pytest.raises((AttributeError, dataclasses.FrozenInstanceError)):
+        chunk.id = "other"
+
+
+def test_encode_stream_chunk_emits_compact_json():
+    """encode_stream_chunk gives compact JSON bytes with every field."""
+    encoded = encode_stream_chunk(_chunk())
+
+    assert isinstance(encoded, bytes)
+    assert b": " not in encoded and b", " not in encoded
+    assert json.loads(encoded) == {
+        "id": "chunk-1",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": "kimi",
+        "choices": [{"index": 0, "delta": {"content": "Hi"}}]
+    }
+
+
+def _response():
+    return ChatResponse(
+        id="resp-1",
+        created=1700000000,
+        model="kimi",
+        choices=[Choice(index=0, message=Message(role="assistant", content="Hello"))],
+        usage=TokenUsage(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+        provider="moonshot"
+    )
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson and with the json fallback."""
+    if request.param and not models.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(models, "ORJSON_AVAILABLE", request.param)
+
+
+def test_to_json_matches_model_dump_json(encoder):
+    """to_json() of a model decodes to the same data as model_dump_json()."""
+    response = _response()
+    assert json.loads(to_json(response)) == json.loads(response.model_dump_json())
+
+
+def test_to_json_handles_containers_and_datetimes(encoder):
+    """Lists and dicts of models, and datetime fields, are encoded."""
+    error = ErrorResponse(
+        error="bad_request",
+        error_type="ValidationError",
+        message="invalid",
+        timestamp=datetime(2024, 1, 1, 12, 30)
+    )
+
+    decoded = json.loads(to_json({"errors": [error], "response": _response()}))
+
+    assert decoded["errors"][0]["timestamp"] == "2024-01-01T12:30:00"
+    assert decoded["response"] == json.loads(_response().model_dump_json())
+
+
+def test_to_json_of_stream_chunk_uses_chunk_encoder(encoder):
+    """Stream chunks go through encode_stream_chunk."""
+    chunk = _chunk()
+    assert to_json(chunk) == encode_stream_chunk(chunk)
+
+
+_REQUEST = {
+    "messages": [{"role": "user", "content": "Hello"}],
+    "temperature": 0.2,
+    "enable_swarm": True
+}
+
+
+def test_validate_chat_request_matches_constructor():
+    """validate_chat_request builds the same request as ChatRequest(**data)."""
+    request = validate_chat_request(_REQUEST)
+
+    assert isinstance(request, ChatRequest)
+    assert request == ChatRequest(**_REQUEST)
+    assert request.max_agents == 100
+
+
+def test_parse_chat_request_from_bytes():
+    """parse_chat_request validates raw JSON bytes."""
+    request = parse_chat_request(json.dumps(_REQUEST).encode())
+    assert request == validate_chat_request(_REQUEST)
+
+
+def test_parse_batch_request_from_bytes():
+    """parse_batch_request validates every nested request."""
+    batch = parse_batch_request(json.dumps({"requests": [_REQUEST, _REQUEST]}))
+
+    assert isinstance(batch, BatchRequest)
+    assert len(batch.requests) == 2
+    assert batch.requests[0] == validate_chat_request(_REQUEST)
+
+
+@pytest.mark.parametrize("data", [
+    {"messages": []},
+    {"messages": [{"role": "assistant", "content": "only assistant"}]},
+    {"messages": [{"role": "user", "content": "   "}]},
+    {"messages": [{"role": "user", "content": "hi"}], "temperature": 3.0},
+])
+def test_ingress_validators_reject_invalid_requests(data):
+    """Invalid requests raise pydantic's ValidationError on every path."""
+    with pytest.raises(ValidationError):
+        validate_chat_request(data)
+    with pytest.raises(ValidationError):
+        parse_chat_request(json.dumps(data))
+
+
+def test_message_list_validators():
+    """validate_messages and parse_messages build Message lists."""
+    raw = [{"role": "system", "content": "Be brief"}, {"role": "user", "content": "Hi"}]
+
+    messages = validate_messages(raw)
+
+    assert messages == [Message(**item) for item in raw]
+    assert parse_messages(json.dumps(raw)) == messages
+    with pytest.raises(ValidationError):
+        validate_messages([{"role": "user", "content": ""}])
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the benchmark latency aggregates.
+"""
+
+import random
+import statistics
+
+import pytest
+
+from benchmarks.performance_comparison import _LatencyStats
+
+
+def _summary(latencies):
+    stats = _LatencyStats()
+    for latency in latencies:
+        stats.add(latency)
+    return stats.summary()
+
+
+def test_empty_summary_is_all_zero():
+    """Test that nothing recorded reports zeros for every field"""
+    summary = _LatencyStats().summary()
+
+    assert set(summary) == {
+        "average_latency_ms", "median_latency_ms", "p95_latency_ms",
+        "p99_latency_ms", "min_latency_ms", "max_latency_ms"
+    }
+    assert all(value == 0 for value in summary.values())
+
+
+def test_single_sample_fills_every_percentile():
+    """Test that one sample is every percentile rather than 0"""
+    summary = _summary([42.0])
+
+    assert summary["median_latency_ms"] == 42.0
+    assert summary["p95_latency_ms"] == 42.0
+    assert summary["p99_latency_ms"] == 42.0
+
+
+@pytest.mark.parametrize("count", [5, 20, 100])
+def test_small_samples_use_nearest_rank(count):
+    """Test that small samples report exact nearest-rank percentiles"""
+    latencies = [float(value) for value in range(1, count + 1)]
+    random.Random(count).shuffle(latencies)
+    ordered = sorted(latencies)
+    last = count - 1
+
+    summary = _summary(latencies)
+
+    assert summary["median_latency_ms"] == ordered[round(0.50 * last)]
+    assert summary["p95_latency_ms"] == ordered[round(0.95 * last)]
+    assert summary["p99_latency_ms"] == ordered[round(0.99 * last)]
+    assert summary["p95_latency_ms"] > 0
+    assert summary["p99_latency_ms"] > 0
+
+
+def test_exact_aggregates():
+    """Test that average, min and max are exact at any sample count"""
+    rng = random.Random(7)
+    latencies = [rng.uniform(1.0, 500.0) for _ in range(1000)]
+
+    summary = _summary(latencies)
+
+    assert summary["average_latency_ms"] == pytest.approx(statistics.fmean(latencies))
+    assert summary["min_latency_ms"] == min(latencies)
+    assert summary["max_latency_ms"] == max(latencies)
+
+
+def test_large_samples_estimate_percentiles():
+    """Test that percentiles past the seed buffer stay close to the exact values"""
+    rng = random.Random(11)
+    latencies = [rng.uniform(0.0, 1000.0) for _ in range(20000)]
+    exact = statistics.quantiles(latencies, n=100)
+
+    summary = _summary(latencies)
+
+    assert summary["median_latency_ms"] == pytest.approx(exact[49], abs=20.0)
+    assert summary["p95_latency_ms"] == pytest.approx(exact[94], abs=20.0)
+    assert summary["p99_latency_ms"] == pytest.approx(exact[98], abs=20.0)
+    assert (
+        summary["median_latency_ms"]
+        <= summary["p95_latency_ms"]
+        <= summary["p99_latency_ms"]
+    )
+
+
+def test_seed_boundary_switches_to_estimates():
+    """Test that exactly SEED_SIZE samples still report ordered percentiles"""
+    latencies = [float(value) for value in range(_LatencyStats.SEED_SIZE)]
+
+    summary = _summary(latencies)
+
+    assert summary["min_latency_ms"] <= summary["median_latency_ms"]
+    assert summary["median_latency_ms"] <= summary["p95_latency_ms"]
+    assert summary["p95_latency_ms"] <= summary["p99_latency_ms"]
+    assert summary["p99_latency_ms"] <= summary["max_latency_ms"]